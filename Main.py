@@ -1,20 +1,44 @@
-# Main.py
+import time
+
+# Taken before the remaining imports so time-to-first-render includes them
+_RUN_START = time.perf_counter()
+
+import importlib
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
-from uuid import uuid4
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-from score_calculator import score_calculator_page
-from scoreboard import scoreboard_page
-from summary_storage import summary_storage_page
-from consistency import compute_consistency_bonuses
-from storage import load_data, save_data
-from supabase_db import load_games
+from storage import league_games, load_data
+from season_store import get_season, get_store
+from metrics import export as export_metrics, observe, set_league, start_http_server, timed
 
 
 PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
 
+# Page label -> (module, page function). Modules are imported on first
+# selection so a cold start only pays for the page being rendered.
+PAGES = {
+    "Calculate Scores": ("score_calculator", "score_calculator_page"),
+    "Scoreboard": ("scoreboard", "scoreboard_page"),
+    "Summary Sheets": ("summary_storage", "summary_storage_page"),
+}
+
+
+def _load_backend_games(session_id, ctx):
+    # Runs on a worker thread; attach the script context so st.secrets and
+    # st.cache_resource behave as they would on the script thread.
+    add_script_run_ctx(ctx=ctx)
+    set_league(session_id)
+    from storage_backends import get_backend
 
+    rows = get_backend().load_games(session_id)
+    # Backends return newest-first; reverse to get chronological order
+    return list(reversed([row["payload"] for row in rows]))
+
+
+@timed("init_state")
 def init_state():
     if "session_id" not in st.session_state:
         try:
@@ -26,49 +50,67 @@ def init_state():
             or os.getenv("LEAGUE_ID")
             or "default_league"
         )
-
-    if "games" not in st.session_state or "summaries" not in st.session_state:
-        # Try loading from Supabase first, fall back to local JSON
-        try:
-            rows = load_games(st.session_state.session_id)
-            games = [row["payload"] for row in rows]
-            # Supabase returns newest-first; reverse to get chronological order
-            games = list(reversed(games))
-        except Exception:
-            games, _ = load_data()
-
+    league = st.session_state.session_id
+    set_league(league)
+
+    store = get_store()
+    if store.needs_load(league):
+        # First session for this league in the process: fetch games from
+        # the storage backend on a worker while the local file is parsed
+        # here; the local games are only used if the backend fails, and
+        # are marked degraded so a later rerun tries the backend again.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            remote = pool.submit(_load_backend_games, league, get_script_run_ctx())
+            local_games, summaries = load_data()
+            try:
+                games, degraded = remote.result(), False
+            except Exception:
+                games, degraded = league_games(local_games, league), True
+        store.load(league, games, degraded)
+        if "summaries" not in st.session_state:
+            st.session_state.summaries = summaries
+    elif "summaries" not in st.session_state:
+        # Games are shared across sessions; only summaries are per session
         _, summaries = load_data()
-        st.session_state.games = games
         st.session_state.summaries = summaries
 
-    if "next_game_id" not in st.session_state:
-        # derive next_game_id from existing games
-        games = st.session_state.games
-        if isinstance(games, list) and games:
-            max_id = max(g.get("game_id", 0) for g in games)
-            st.session_state.next_game_id = max_id + 1
-        else:
-            st.session_state.next_game_id = 1
+    # Sessions keep only the version they last rendered; the games
+    # themselves live in the shared store.
+    st.session_state.season_version = store.get(league).version
+
 
+def render_page(page, players):
+    module_name, func_name = PAGES[page]
+    module = importlib.import_module(module_name)
+    getattr(module, func_name)(players)
 
 
 def main():
     st.set_page_config(page_title="Mario Party Championship", layout="wide")
+    start_http_server()
     init_state()
 
     st.title("Mario Party Championship – 2025 Rules")
+    if get_season(st.session_state.session_id).degraded:
+        st.warning("Couldn't load games from storage; showing local games. Retrying shortly.")
 
     page = st.sidebar.radio(
         "Navigation",
-        ["Calculate Scores", "Scoreboard", "Summary Sheets"],
+        list(PAGES),
+    )
+
+    render_page(page, PLAYERS)
+
+    # Time-to-first-render: the first full run of each browser session
+    if "time_to_first_render" not in st.session_state:
+        elapsed = time.perf_counter() - _RUN_START
+        st.session_state.time_to_first_render = elapsed
+        observe("time_to_first_render", elapsed)
+    st.sidebar.caption(
+        f"First render: {st.session_state.time_to_first_render * 1000:.0f} ms"
     )
 
-    if page == "Calculate Scores":
-        score_calculator_page(PLAYERS)
-    elif page == "Scoreboard":
-        scoreboard_page(PLAYERS)
-    elif page ==  "Summary Sheets":
-        summary_storage_page(PLAYERS)
+    export_metrics()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,81 @@
 # consistency.py
+from metrics import timed
 
+# ========= RULESET (consistency bonuses) =========
+BACK_TO_BACK_TOP2_POINTS = 2
+THREE_STRAIGHT_TOP2_POINTS = 3
+NO_FOURTH_IN_FIVE_POINTS = 2
+
+
+class ConsistencyTracker:
+    """
+    Applies the consistency rules one game at a time, in season order.
+
+    Only a few values are kept per player (games played, last two
+    placements, whether the current five-game window is free of 4th
+    places), so a season can be streamed through it in chunks.
+    """
+
+    def __init__(self, players):
+        self.players = players
+        self.totals = {p: 0 for p in players}
+        self._played = {p: 0 for p in players}
+        self._recent = {p: () for p in players}
+        self._window_clean = {p: True for p in players}
+
+    def add_game_rules(self, game):
+        """
+        Advance one game and report which rules fired, without scoring.
+        Returns {player: (back_to_back, three_straight, no_fourth)} for
+        every player with a placement in the game.
+        """
+        results = game.get("results", {})
+        fired = {}
+        for p in self.players:
+            if p not in results or "placement" not in results[p]:
+                continue
+            pl = int(results[p]["placement"])
+            n = self._played[p] = self._played[p] + 1
+            recent = self._recent[p]
+
+            # ---------- Back-to-back Top 2 ----------
+            back_to_back = bool(recent) and recent[-1] <= 2 and pl <= 2
+
+            # ---------- Top 2 in three straight ----------
+            three_straight = (
+                len(recent) == 2 and recent[0] <= 2 and recent[1] <= 2 and pl <= 2
+            )
+
+            # ---------- No 4th places in last 5 ----------
+            # Windows are games 1–5 and 6–10, bonus applied on the last game
+            if n in (1, 6):
+                self._window_clean[p] = True
+            if pl == 4:
+                self._window_clean[p] = False
+            no_fourth = n in (5, 10) and self._window_clean[p]
+
+            self._recent[p] = (recent + (pl,))[-2:]
+            fired[p] = (back_to_back, three_straight, no_fourth)
+        return fired
+
+    def add_game(self, game):
+        """
+        Score one game. Returns {player: bonus} for every player with a
+        placement in it (0 when no bonus applies).
+        """
+        bonuses = {}
+        for p, (back_to_back, three_straight, no_fourth) in self.add_game_rules(game).items():
+            bonus = (
+                back_to_back * BACK_TO_BACK_TOP2_POINTS
+                + three_straight * THREE_STRAIGHT_TOP2_POINTS
+                + no_fourth * NO_FOURTH_IN_FIVE_POINTS
+            )
+            self.totals[p] += bonus
+            bonuses[p] = bonus
+        return bonuses
+
+
+@timed("consistency.compute_consistency_bonuses")
 def compute_consistency_bonuses(games, players):
     """
     Compute total consistency bonus points per player based on the full season.
@@ -19,62 +95,11 @@ def compute_consistency_bonuses(games, players):
     # Sort games by game_id to get season order
     games_sorted = sorted(games, key=lambda g: g.get("game_id", 0))
 
-    # Build per-player placement timeline: list of (game_id, placement)
-    placements = {p: [] for p in players}
+    tracker = ConsistencyTracker(players)
+    per_game_bonus = {p: {} for p in players}
     for g in games_sorted:
         gid = g.get("game_id")
-        results = g.get("results", {})
-        for p in players:
-            if p in results and "placement" in results[p]:
-                placements[p].append((gid, int(results[p]["placement"])))
-
-    # Initialize per-game bonus buckets
-    per_game_bonus = {
-        p: {gid: 0 for gid, _ in placements[p]} for p in players
-    }
-
-    for p in players:
-        pl_list = placements[p]
-        n = len(pl_list)
-        if n == 0:
-            continue
-
-        # ---------- Back-to-back Top 2 ----------
-        # If player is Top 2 in games i-1 and i, give +2 on game i
-        for i in range(1, n):
-            gid_prev, pl_prev = pl_list[i - 1]
-            gid_curr, pl_curr = pl_list[i]
-            if pl_prev <= 2 and pl_curr <= 2:
-                per_game_bonus[p][gid_curr] += 2
-
-        # ---------- Top 2 in three straight ----------
-        # If player is Top 2 in games i-2, i-1, i, give +3 on game i
-        for i in range(2, n):
-            gid1, pl1 = pl_list[i - 2]
-            gid2, pl2 = pl_list[i - 1]
-            gid3, pl3 = pl_list[i]
-            if pl1 <= 2 and pl2 <= 2 and pl3 <= 2:
-                per_game_bonus[p][gid3] += 3
-
-        # ---------- No 4th places in last 5 ----------
-        # Window 1: Games 1–5, bonus applied at game 5
-        if n >= 5:
-            window1 = pl_list[0:5]
-            if all(pl != 4 for _, pl in window1):
-                gid5, _ = pl_list[4]
-                per_game_bonus[p][gid5] += 2
-
-        # Window 2: Games 6–10, bonus applied at game 10
-        # (Assuming a 10-game season, so use entries 5–9 as "games 6–10")
-        if n >= 10:
-            window2 = pl_list[5:10]
-            if all(pl != 4 for _, pl in window2):
-                gid10, _ = pl_list[9]
-                per_game_bonus[p][gid10] += 2
-
-    # Sum total consistency bonus per player
-    total_bonus = {
-        p: sum(per_game_bonus[p].values()) for p in players
-    }
-
-    return total_bonus, per_game_bonus
+        for p, bonus in tracker.add_game(g).items():
+            per_game_bonus[p][gid] = per_game_bonus[p].get(gid, 0) + bonus
+
+    return tracker.totals, per_game_bonus
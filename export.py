@@ -0,0 +1,210 @@
+# export.py
+"""
+Export per-game breakdowns, standings and summary snapshots to CSV or
+Parquet.
+
+Games are streamed from the storage backend in chunks and written out as
+they are scored, so memory stays flat however much history a league has.
+On Supabase, several leagues are paged concurrently.
+
+    python export.py --all --format parquet --out exports/
+    python export.py --league default_league --league friday_night
+"""
+import argparse
+import csv
+import io
+import os
+import tempfile
+import zipfile
+
+from consistency import ConsistencyTracker
+from scoreboard import build_standings, game_breakdown_rows
+from storage import load_data
+from storage_backends import get_backend
+
+FORMATS = ("csv", "parquet")
+TABLES = ("breakdown", "standings", "summaries")
+DEFAULT_CHUNK_SIZE = 500
+
+
+class CsvSink:
+    """Appends row dicts to a CSV file; the header comes from the first rows."""
+
+    def __init__(self, path):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = None
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]))
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """Appends row dicts to a Parquet file, one row group per write."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError(
+                "Parquet export needs pyarrow. Install it with `pip install pyarrow`."
+            ) from exc
+        self._pa = pa
+        self._pq = pq
+        self._path = path
+        self._writer = None
+
+    def write(self, rows):
+        if not rows:
+            return
+        schema = self._writer.schema if self._writer else None
+        table = self._pa.Table.from_pylist(rows, schema=schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+
+class LeagueTotals:
+    """Running totals for one league while its games stream past."""
+
+    def __init__(self, session_id, players):
+        self.session_id = session_id
+        self.players = players
+        self.tracker = ConsistencyTracker(players)
+        self.base_totals = {p: 0 for p in players}
+        self.wins = {p: 0 for p in players}
+        self.podiums = {p: 0 for p in players}
+
+    def add_games(self, games):
+        """Score a chunk of games; returns their breakdown rows."""
+        rows = []
+        for g in games:
+            bonuses = self.tracker.add_game(g)
+            for row in game_breakdown_rows(g, self.players):
+                p = row["Player"]
+                self.base_totals[p] += row["Game Total"]
+                if row["Place"] == 1:
+                    self.wins[p] += 1
+                if row["Place"] in (1, 2, 3):
+                    self.podiums[p] += 1
+                row["Consistency"] = bonuses.get(p, 0)
+                row["Total"] = row["Game Total"] + row["Consistency"]
+                rows.append({"League": self.session_id, **row})
+        return rows
+
+    def standings_rows(self):
+        rows, *_ = build_standings(
+            self.players, self.base_totals, self.wins, self.podiums, self.tracker.totals
+        )
+        return [{"League": self.session_id, **row} for row in rows]
+
+
+def export_leagues(session_ids, sinks, players=None, backend=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream the leagues' games through the breakdown and consistency
+    computations, writing breakdown rows chunk by chunk and each league's
+    standings at the end. Games are scored in game_id order, as every
+    backend's iter_games returns them; chunks of different leagues may
+    interleave in the breakdown table.
+
+    Players default to those in each league's first game.
+    """
+    backend = backend or get_backend()
+    leagues = {}
+
+    for session_id, chunk in backend.iter_games_many(session_ids, chunk_size):
+        league = leagues.get(session_id)
+        if league is None:
+            league = leagues[session_id] = LeagueTotals(
+                session_id, players or list(chunk[0]["results"])
+            )
+        sinks["breakdown"].write(league.add_games(chunk))
+
+    for session_id in session_ids:
+        # Leagues with no stored games get no standings rows
+        if session_id in leagues:
+            sinks["standings"].write(leagues[session_id].standings_rows())
+
+
+def summary_rows(summaries):
+    """Flatten saved summary snapshots into one row per player."""
+    for snapshot in summaries:
+        for record in snapshot["standings"]:
+            yield {"Summary": snapshot["label"], **record}
+
+
+def export(session_ids, out_dir, fmt="csv", players=None, summaries=None,
+           backend=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write breakdown, standings and summaries tables for the given leagues
+    into `out_dir`, one file per table with a League column.
+    Summaries default to those in the local data file.
+    Returns {table: path}.
+    """
+    if fmt not in SINKS:
+        raise ValueError(f"Unknown export format {fmt!r}. Use one of: {', '.join(FORMATS)}.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    paths = {table: os.path.join(out_dir, f"{table}.{fmt}") for table in TABLES}
+    sinks = {}
+    try:
+        for table, path in paths.items():
+            sinks[table] = SINKS[fmt](path)
+
+        export_leagues(session_ids, sinks, players, backend, chunk_size)
+
+        if summaries is None:
+            _, summaries = load_data()
+        sinks["summaries"].write(list(summary_rows(summaries)))
+    finally:
+        for sink in sinks.values():
+            sink.close()
+    return paths
+
+
+def export_zip(session_ids, fmt="csv", players=None, summaries=None):
+    """Run an export into a temporary directory and return it as zip bytes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = export(session_ids, tmp, fmt, players, summaries)
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path in paths.values():
+                if os.path.exists(path):
+                    zf.write(path, os.path.basename(path))
+        return buf.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Mario Party standings and breakdowns.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--league", action="append", help="League (session_id) to export; repeatable")
+    target.add_argument("--all", action="store_true", help="Export every league in storage")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    backend = get_backend()
+    session_ids = backend.list_sessions() if args.all else args.league
+    paths = export(session_ids, args.out, args.format, backend=backend, chunk_size=args.chunk_size)
+    for table, path in paths.items():
+        print(f"{table}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# fake_supabase.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TABLE_PATH = "/rest/v1/mario_scores"
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the Supabase REST API, covering only what
+    supabase_async uses on `mario_scores`. For local testing:
+
+        with FakeSupabase() as fake:
+            pool = SupabasePool(fake.url, "test-key")
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.rows = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- table operations ----------
+    def insert(self, row):
+        with self._lock:
+            row = dict(row, id=len(self.rows) + 1)
+            self.rows.append(row)
+            return row
+
+    def select(self, params):
+        with self._lock:
+            rows = list(self.rows)
+        rows = [r for r in rows if _matches(r, params)]
+
+        # "col.dir,col.dir", applied last key first; stable sorts keep ties
+        for term in reversed(params.get("order", "id.asc").split(",")):
+            col, _, direction = term.rpartition(".")
+            rows.sort(key=lambda r: _column(r, col), reverse=direction == "desc")
+
+        offset = int(params.get("offset", 0))
+        limit = params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+
+        select = params.get("select", "*")
+        if select != "*":
+            cols = select.split(",")
+            rows = [{c: r.get(c) for c in cols} for r in rows]
+        return rows
+
+    def update(self, params, changes):
+        with self._lock:
+            matched = [r for r in self.rows if _matches(r, params)]
+            for r in matched:
+                r.update(changes)
+            return [dict(r) for r in matched]
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _params(self):
+                parsed = urlparse(self.path)
+                if parsed.path != TABLE_PATH:
+                    return None
+                return {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"null")
+
+            def _send(self, status, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                params = self._params()
+                if params is None:
+                    return self._send(404, {"message": "not found"})
+                self._send(200, fake.select(params))
+
+            def do_POST(self):
+                if self._params() is None:
+                    return self._send(404, {"message": "not found"})
+                body = self._body()
+                rows = body if isinstance(body, list) else [body]
+                self._send(201, [fake.insert(r) for r in rows])
+
+            def do_PATCH(self):
+                params = self._params()
+                if params is None:
+                    return self._send(404, {"message": "not found"})
+                self._send(200, fake.update(params, self._body()))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _column(row, col):
+    # Plain columns, or one level into JSON: "payload->game_id"
+    col, _, key = col.partition("->")
+    value = row.get(col)
+    return value.get(key) if key else value
+
+
+def _matches(row, params):
+    # Only the "col=eq.value" filter form is supported
+    for col, value in params.items():
+        if col in ("select", "order", "limit", "offset"):
+            continue
+        op, _, expected = value.partition(".")
+        if op == "eq" and str(row.get(col)) != expected:
+            return False
+    return True
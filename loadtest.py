@@ -0,0 +1,217 @@
+# loadtest.py
+"""
+Concurrent-session load test for the Streamlit app.
+
+Drives N simulated browser sessions with Streamlit's headless AppTest
+against a local FakeSupabase. Each session opens the app, enters and
+saves games, views the scoreboard and the summary sheets. For each N,
+reports per-page rerun latency percentiles, rerun throughput and how
+this process's memory grows per added session.
+
+All sessions live in this one process, as they would on one server, so
+they share the season store and the standings caches. AppTest swaps
+process-wide globals (the runtime, st.secrets) on every run, so the
+sessions can't rerun from parallel threads; they take turns, one rerun
+each, round-robin. Latency is each rerun's own run time, and throughput
+is what one app process sustains.
+
+Every save is checked against Supabase: the stored payload must carry
+the placements and coins that were entered.
+
+    python loadtest.py --sessions 1 5 10 25 --iterations 3
+"""
+import argparse
+import os
+import random
+import resource
+import time
+
+import httpx
+from streamlit.testing.v1 import AppTest
+
+from fake_supabase import FakeSupabase, TABLE_PATH
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Main.py")
+PERCENTILES = (50, 95, 99)
+
+
+def _timed_run(at, label, timings):
+    start = time.perf_counter()
+    at.run()
+    timings.append((label, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{label} raised: {at.exception[0].value}")
+
+
+def _inputs(at, field):
+    """{player: widget} for the per-player inputs keyed "<player>_<field>_<game_id>"."""
+    return {
+        w.key.split(f"_{field}_")[0]: w
+        for w in list(at.selectbox) + list(at.number_input)
+        if w.key and f"_{field}_" in w.key
+    }
+
+
+def _matching_saves(fake_url, league, entered):
+    """How many stored games in `league` have exactly the entered placements and coins."""
+    res = httpx.get(
+        f"{fake_url}{TABLE_PATH}",
+        params={"select": "payload", "session_id": f"eq.{league}"},
+    )
+    res.raise_for_status()
+    return sum(
+        {
+            p: (r.get("placement"), r.get("coins"))
+            for p, r in row["payload"]["results"].items()
+        } == entered
+        for row in res.json()
+    )
+
+
+def simulate_session(fake_url, league, iterations, timings, timeout=60):
+    """
+    One simulated viewer, as a generator: each next() performs one rerun
+    and appends (page, seconds) to `timings`.
+    """
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.secrets["SUPABASE_URL"] = fake_url
+    at.secrets["SUPABASE_SERVICE_ROLE_KEY"] = "loadtest"
+    at.secrets["LEAGUE_ID"] = league
+
+    _timed_run(at, "startup", timings)
+    yield
+
+    for _ in range(iterations):
+        # ---------- Enter a game ----------
+        at.sidebar.radio[0].set_value("Calculate Scores")
+        _timed_run(at, "Calculate Scores", timings)
+        yield
+
+        placement_inputs = _inputs(at, "placement")
+        coin_inputs = _inputs(at, "coins")
+        entered = {}
+        for player, placement in zip(placement_inputs, random.sample([1, 2, 3, 4], 4)):
+            coins = random.randint(0, 120)
+            placement_inputs[player].set_value(placement)
+            coin_inputs[player].set_value(coins)
+            entered[player] = (placement, coins)
+        _timed_run(at, "Calculate Scores (input)", timings)
+        yield
+
+        before = _matching_saves(fake_url, league, entered)
+        save = next(b for b in at.button if "Save Game" in b.label)
+        save.click()
+        _timed_run(at, "Calculate Scores (save)", timings)
+        if at.error:
+            raise RuntimeError(f"save failed: {at.error[0].value}")
+        if _matching_saves(fake_url, league, entered) != before + 1:
+            raise RuntimeError(f"saved payload doesn't match the input {entered}")
+        yield
+
+        # ---------- View ----------
+        at.sidebar.radio[0].set_value("Scoreboard")
+        _timed_run(at, "Scoreboard", timings)
+        yield
+
+        at.sidebar.radio[0].set_value("Summary Sheets")
+        _timed_run(at, "Summary Sheets", timings)
+        yield
+
+
+def rss_mb():
+    """Current resident memory of this process in MB (peak if unavailable)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        # ru_maxrss is KB on Linux, bytes on macOS; close enough as a fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_level(fake_url, sessions, iterations, leagues):
+    """Run `sessions` viewers round-robin in this process and summarize their reruns."""
+    timings = []
+    active = [
+        simulate_session(fake_url, f"loadtest_{i % leagues}", iterations, timings)
+        for i in range(sessions)
+    ]
+    start = time.perf_counter()
+    while active:
+        # One rerun per session per round; drop sessions that are done
+        active = [s for s in active if next(s, StopIteration) is not StopIteration]
+    elapsed = time.perf_counter() - start
+
+    by_page = {}
+    for page, seconds in timings:
+        by_page.setdefault(page, []).append(seconds)
+
+    return {
+        "sessions": sessions,
+        "reruns": len(timings),
+        "elapsed": elapsed,
+        "throughput": len(timings) / elapsed if elapsed else 0.0,
+        "mean_run": sum(seconds for _, seconds in timings) / len(timings),
+        "rss_mb": rss_mb(),
+        "pages": {
+            page: {pct: percentile(sorted(values), pct) for pct in PERCENTILES}
+            for page, values in by_page.items()
+        },
+    }
+
+
+def warm_up(fake_url):
+    """One throwaway session through every page, so imports don't count as session memory."""
+    for _ in simulate_session(fake_url, "loadtest_warmup", 1, []):
+        pass
+
+
+def print_report(result):
+    print(
+        f"\n=== {result['sessions']} sessions: {result['reruns']} reruns in "
+        f"{result['elapsed']:.1f}s ({result['throughput']:.1f} reruns/s, "
+        f"mean rerun {result['mean_run'] * 1000:.0f} ms), "
+        f"RSS {result['rss_mb']:.0f} MB, +{result['mb_per_session']:.1f} MB per added session ==="
+    )
+    header = "  ".join(f"{f'p{pct} ms':>7}" for pct in PERCENTILES)
+    print(f"{'page':<28}{header}")
+    for page, pcts in result["pages"].items():
+        cols = "  ".join(f"{pcts[pct] * 1000:>7.0f}" for pct in PERCENTILES)
+        print(f"{page:<28}{cols}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with N simulated sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25],
+                        help="Concurrent session counts to run, in order")
+    parser.add_argument("--iterations", type=int, default=3,
+                        help="Enter/view cycles per session")
+    parser.add_argument("--leagues", type=int, default=1,
+                        help="Spread sessions across this many leagues")
+    args = parser.parse_args(argv)
+
+    # The fake only stands in for Supabase
+    os.environ["STORAGE_BACKEND"] = "supabase"
+
+    with FakeSupabase() as fake:
+        warm_up(fake.url)
+        prev_sessions, prev_rss = 0, rss_mb()
+        for sessions in args.sessions:
+            result = run_level(fake.url, sessions, args.iterations, args.leagues)
+            # Growth against the previous level, spread over the sessions added
+            added = max(sessions - prev_sessions, 1)
+            result["mb_per_session"] = (result["rss_mb"] - prev_rss) / added
+            print_report(result)
+            prev_sessions, prev_rss = sessions, result["rss_mb"]
+
+
+if __name__ == "__main__":
+    main()
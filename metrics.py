@@ -0,0 +1,193 @@
+# metrics.py
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ========= CONFIG =========
+# Metrics are off unless METRICS_ENABLED is set. When off, every timed call
+# costs one flag check and nothing is recorded.
+ENABLED = os.getenv("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+METRICS_FILE = os.getenv("METRICS_FILE", "metrics.prom")
+METRICS_PORT = os.getenv("METRICS_PORT")
+# Loopback only by default: the labels include league names
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Latency bucket upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_histograms = {}  # (name, league) -> [bucket_counts, count, sum]
+_league = threading.local()
+_server = None
+_warned = set()
+
+logger = logging.getLogger(__name__)
+
+
+def set_league(league):
+    """Tag every measurement made on this thread with the given league."""
+    _league.value = league
+
+
+def current_league():
+    return getattr(_league, "value", None) or "unknown"
+
+
+def observe(name, seconds, league=None):
+    """Record one latency sample for `name`."""
+    if not ENABLED:
+        return
+    key = (name, league or current_league())
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(BUCKETS), 0, 0.0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[0][i] += 1
+                break
+        hist[1] += 1
+        hist[2] += seconds
+
+
+@contextmanager
+def timer(name):
+    """Time the enclosed block as `name`."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator that records the wrapped function's latency as `name`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def render_prometheus():
+    """
+    Render all histograms in Prometheus text exposition format.
+    One `mario_latency_seconds` histogram, labelled by op and league.
+    """
+    with _lock:
+        snapshot = {
+            key: (list(h[0]), h[1], h[2]) for key, h in _histograms.items()
+        }
+
+    lines = [
+        "# HELP mario_latency_seconds Latency of app pages, scoring and storage calls.",
+        "# TYPE mario_latency_seconds histogram",
+    ]
+    for (name, league), (buckets, count, total) in sorted(snapshot.items()):
+        labels = f'op="{_escape(name)}",league="{_escape(league)}"'
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(
+                f'mario_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+            )
+        lines.append(f'mario_latency_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"mario_latency_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"mario_latency_seconds_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _warn_once(what, message):
+    # Instrumentation problems are logged, once per target, and never
+    # raised into the app
+    if what not in _warned:
+        _warned.add(what)
+        logger.warning(message)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def export(path=None):
+    """
+    Write the current metrics to `path` (defaults to METRICS_FILE).
+    Written to a temp file and renamed so scrapers never see a partial file.
+    Each call gets its own temp file, so concurrent reruns don't collide.
+    A failed write is logged and skipped.
+    """
+    if not ENABLED:
+        return
+    path = path or METRICS_FILE
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(path)),
+        )
+    except OSError as exc:
+        _warn_once(path, f"Can't write metrics to {path}: {exc}")
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, path)
+    except BaseException as exc:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        if not isinstance(exc, OSError):
+            raise
+        _warn_once(path, f"Can't write metrics to {path}: {exc}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port=None):
+    """
+    Serve /metrics on a background thread (once per process), on
+    METRICS_HOST. Does nothing unless metrics are enabled and a port is
+    configured. If the port can't be bound, that is logged and not retried.
+    """
+    global _server
+    port = port or METRICS_PORT
+    if not ENABLED or not port:
+        return
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            server = ThreadingHTTPServer((METRICS_HOST, int(port)), _MetricsHandler)
+        except (OSError, ValueError) as exc:
+            # Remember the failure so later reruns don't try again
+            _server = exc
+            _warn_once("server", f"Can't serve metrics on {METRICS_HOST}:{port}: {exc}")
+            return
+        _server = server
+    threading.Thread(target=server.serve_forever, daemon=True).start()
@@ -0,0 +1,205 @@
+# recompute.py
+"""
+Rebuild the stored per-game `points` of every league with the current
+scoring rules, e.g. after a change to score_calculator's constants.
+
+Leagues are sharded across a process pool for loading and re-scoring;
+this process is the only writer, sending each league's corrected payloads
+back in batches. Finished leagues are recorded in a checkpoint file, so an
+interrupted run resumes where it left off (re-running a half-written league
+is harmless: the rewrite is idempotent). A league that fails, or loads no
+games, is not checkpointed, and the exit status is 1.
+
+    python recompute.py --dry-run          # show what would change
+    python recompute.py --workers 4        # rewrite every league
+    python recompute.py --league friday_night
+
+Running app processes keep the points they already loaded until restarted.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from score_calculator import compute_game_points
+from standings_cache import ruleset_constants
+from storage_backends import get_backend
+
+CHECKPOINT_FILE = "recompute_checkpoint.json"
+DEFAULT_BATCH_SIZE = 100
+
+
+def rescore(payload):
+    """Points for one stored game under the current rules."""
+    players = list(payload["results"])
+    return compute_game_points(payload, players)
+
+
+def recompute_league(session_id):
+    """
+    Re-score one league without writing anything. Runs in a worker process.
+
+    Returns {"session_id", "games", "changed", "errors", "diffs"}:
+    changed holds the rewritten rows ({"id", "payload"}) and diffs lists
+    (game_id, {player: (old, new)}) for each of them.
+    """
+    rows = get_backend().load_games(session_id, limit=None)
+
+    changed = []
+    diffs = []
+    errors = []
+    for row in rows:
+        payload = row["payload"]
+        try:
+            new_points = rescore(payload)
+        except (KeyError, TypeError, ValueError) as exc:
+            errors.append((row.get("game_id"), f"{type(exc).__name__}: {exc}"))
+            continue
+
+        old_points = payload.get("points", {})
+        if old_points == new_points:
+            continue
+
+        diffs.append((
+            payload.get("game_id", row.get("game_id")),
+            {
+                p: (old_points.get(p), new_points[p])
+                for p in new_points
+                if old_points.get(p) != new_points[p]
+            },
+        ))
+        changed.append({"id": row["id"], "payload": dict(payload, points=new_points)})
+
+    return {
+        "session_id": session_id,
+        "games": len(rows),
+        "changed": changed,
+        "errors": errors,
+        "diffs": diffs,
+    }
+
+
+def write_league(backend, result, batch_size=DEFAULT_BATCH_SIZE):
+    """Write one league's re-scored rows back, `batch_size` rows per call."""
+    changed = result["changed"]
+    for i in range(0, len(changed), batch_size):
+        backend.update_games(result["session_id"], changed[i:i + batch_size])
+
+
+def rules_fingerprint():
+    return json.dumps(ruleset_constants(), sort_keys=True, default=str)
+
+
+def load_checkpoint(path):
+    """
+    Leagues already finished under the current rules. A checkpoint made
+    under different rules is ignored.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+    if data.get("rules") != rules_fingerprint():
+        return set()
+    return set(data.get("done", []))
+
+
+def save_checkpoint(path, done):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"rules": rules_fingerprint(), "done": sorted(done)}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def print_diffs(result):
+    for game_id, diff in result["diffs"]:
+        changes = ", ".join(f"{p} {old} -> {new}" for p, (old, new) in diff.items())
+        print(f"    game {game_id}: {changes}")
+    for game_id, error in result["errors"]:
+        print(f"    game {game_id}: skipped ({error})")
+
+
+def run(session_ids, workers=None, dry_run=False, batch_size=DEFAULT_BATCH_SIZE,
+        checkpoint=CHECKPOINT_FILE, resume=True):
+    """
+    Recompute the given leagues across a process pool, printing progress.
+    Workers only load and re-score; all writes happen here, one league at
+    a time, so backends never see concurrent rewrites.
+    Returns (results, failed): the per-league results and the session_ids
+    that failed or loaded no games.
+    """
+    done = load_checkpoint(checkpoint) if resume and not dry_run else set()
+    pending = [sid for sid in session_ids if sid not in done]
+    skipped = len(session_ids) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} league(s) already done, {len(pending)} to go")
+
+    backend = None if dry_run else get_backend()
+    results = []
+    failed = []
+    # Spawn, not fork: a forked child would inherit the Supabase pool's
+    # event loop without the thread that runs it.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(recompute_league, sid): sid for sid in pending}
+        for n, future in enumerate(as_completed(futures), start=1):
+            sid = futures[future]
+            progress = f"[{n}/{len(pending)}] {sid}"
+            try:
+                result = future.result()
+                if not result["games"]:
+                    # Listed leagues have games; an empty read is not "done"
+                    raise RuntimeError("no games loaded")
+                if not dry_run:
+                    write_league(backend, result, batch_size)
+            except Exception as exc:
+                print(f"{progress}: failed ({exc})")
+                failed.append(sid)
+                continue
+
+            results.append(result)
+            action = "would change" if dry_run else "rewrote"
+            print(
+                f"{progress}: {result['games']} games, "
+                f"{action} {len(result['changed'])}, {len(result['errors'])} skipped"
+            )
+            if dry_run:
+                print_diffs(result)
+            else:
+                done.add(sid)
+                save_checkpoint(checkpoint, done)
+    return results, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute stored game points with the current rules.")
+    parser.add_argument("--league", action="append", help="Only these leagues (default: all); repeatable")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Games per write")
+    parser.add_argument("--dry-run", action="store_true", help="Show the changes without writing")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and redo every league")
+    args = parser.parse_args(argv)
+
+    session_ids = args.league or get_backend().list_sessions()
+    results, failed = run(
+        session_ids,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        checkpoint=args.checkpoint,
+        resume=not args.restart,
+    )
+    changed = sum(len(r["changed"]) for r in results)
+    games = sum(r["games"] for r in results)
+    print(f"Done: {len(results)} league(s), {games} games, {changed} {'to change' if args.dry_run else 'rewritten'}")
+    if failed:
+        print(f"Failed: {len(failed)} league(s): {', '.join(sorted(failed))}; re-run to retry them")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# replay.py
+"""
+What-if replay: re-score the stored history under candidate rulesets and
+report how final standings and ranks would change.
+
+Each game is reduced once to ruleset-independent features (placement,
+bonus stars, coins, which bonuses were won, which consistency rules
+fired). Every ruleset is then scored in one numpy pass over those
+features, so hundreds of rulesets cost little more than one.
+
+    python replay.py rulesets.json --all --out replay.csv
+
+rulesets.json is a list of objects, each with a unique "name"; omitted
+fields keep the current rules. The current rules are always scored as
+the baseline, named "Current":
+
+    [{"name": "README", "placement_points": [10, 6, 3, 0]},
+     {"name": "Cap 2", "coin_threshold_max": 2}]
+"""
+import argparse
+import json
+from dataclasses import dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+import consistency
+import score_calculator
+from consistency import ConsistencyTracker
+from storage_backends import get_backend
+
+# Rulesets are scored this many at a time to bound peak memory
+RULESET_BATCH = 64
+BASELINE_NAME = "Current"
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """Every tunable point value. Defaults are the current rules."""
+    name: str
+    placement_points: tuple = tuple(
+        score_calculator.PLACEMENT_POINTS[pl] for pl in (1, 2, 3, 4)
+    )
+    bonus_star_points: int = score_calculator.BONUS_STAR_POINTS
+    coin_threshold: int = score_calculator.COIN_THRESHOLD
+    coin_threshold_max: int = score_calculator.COIN_THRESHOLD_MAX
+    coin_threshold_points: int = score_calculator.COIN_THRESHOLD_POINTS
+    most_coins_points: int = score_calculator.MOST_COINS_POINTS
+    least_coins_points: int = score_calculator.LEAST_COINS_POINTS
+    items_points: int = score_calculator.MOST_ITEMS_POINTS
+    spaces_points: int = score_calculator.MOST_SPACES_POINTS
+    minigame_most_wins_points: int = score_calculator.MINIGAME_MOST_WINS_POINTS
+    minigame_second_wins_points: int = score_calculator.MINIGAME_SECOND_WINS_POINTS
+    back_to_back_points: int = consistency.BACK_TO_BACK_TOP2_POINTS
+    three_straight_points: int = consistency.THREE_STRAIGHT_TOP2_POINTS
+    no_fourth_points: int = consistency.NO_FOURTH_IN_FIVE_POINTS
+
+    def __post_init__(self):
+        if self.coin_threshold <= 0:
+            raise ValueError(f"Ruleset {self.name!r}: coin_threshold must be positive.")
+
+    @classmethod
+    def from_dict(cls, data):
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown ruleset fields: {', '.join(sorted(unknown))}")
+        if not data.get("name"):
+            raise ValueError("Every ruleset needs a name.")
+        data = dict(data)
+        if "placement_points" in data:
+            data["placement_points"] = tuple(data["placement_points"])
+            if len(data["placement_points"]) != 4:
+                raise ValueError("placement_points needs one value per place (4).")
+        return cls(**data)
+
+
+# Feature columns that are scored linearly: (feature, Ruleset field)
+LINEAR_FEATURES = (
+    ("bonus_stars", "bonus_star_points"),
+    ("most_coins", "most_coins_points"),
+    ("least_coins", "least_coins_points"),
+    ("most_items", "items_points"),
+    ("most_spaces", "spaces_points"),
+    ("minigame_most", "minigame_most_wins_points"),
+    ("minigame_second", "minigame_second_wins_points"),
+    ("back_to_back", "back_to_back_points"),
+    ("three_straight", "three_straight_points"),
+    ("no_fourth", "no_fourth_points"),
+)
+
+
+def game_features(game, players, tracker):
+    """
+    Ruleset-independent features of ONE game, one dict per player.
+    Mirrors compute_game_points_breakdown plus the consistency rules, so
+    the current ruleset reproduces the scoreboard's totals.
+    """
+    results = game["results"]
+    coin_values = {p: int(results[p]["coins"]) for p in players}
+    max_coins = max(coin_values.values())
+    min_coins = min(coin_values.values())
+
+    minigames = score_calculator.minigame_awards(results, players)
+    fired = tracker.add_game_rules(game)
+
+    rows = []
+    for p in players:
+        r = results[p]
+        back_to_back, three_straight, no_fourth = fired.get(p, (False, False, False))
+        rows.append({
+            "player": p,
+            "placement": int(r["placement"]),
+            "coins": coin_values[p],
+            "bonus_stars": int(r["bonus_stars"]),
+            "most_coins": coin_values[p] == max_coins and max_coins > 0,
+            "least_coins": coin_values[p] == min_coins,
+            "most_items": bool(r.get("most_items_used", False)),
+            "most_spaces": bool(r.get("most_spaces_travelled", False)),
+            "minigame_most": minigames[p][0],
+            "minigame_second": minigames[p][1],
+            "back_to_back": back_to_back,
+            "three_straight": three_straight,
+            "no_fourth": no_fourth,
+        })
+    return rows
+
+
+def load_features(session_ids, backend=None):
+    """
+    Feature table for every stored game in the given leagues, with
+    `league` and `player` columns. Games are taken in game_id order.
+    """
+    backend = backend or get_backend()
+    games_by_league = {}
+    for session_id, chunk in backend.iter_games_many(session_ids):
+        games_by_league.setdefault(session_id, []).extend(chunk)
+
+    rows = []
+    for session_id in session_ids:
+        games = games_by_league.pop(session_id, None)
+        if not games:
+            continue
+        players = list(games[0]["results"])
+        tracker = ConsistencyTracker(players)
+        for g in games:
+            for row in game_features(g, players, tracker):
+                row["league"] = session_id
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def score_rulesets(features, rulesets):
+    """
+    Total points per (league, player) under each ruleset.
+    Returns (groups, totals): groups is a DataFrame of league/player, and
+    totals an int array of shape (len(rulesets), len(groups)).
+    """
+    groups, group_idx = _group_index(features)
+    placement_idx = features["placement"].to_numpy() - 1
+    coins = features["coins"].to_numpy()
+    linear = np.stack(
+        [features[col].to_numpy(dtype=np.int64) for col, _ in LINEAR_FEATURES], axis=1
+    )
+
+    # Sort rows by group once so per-group sums are a single reduceat
+    order = np.argsort(group_idx, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(group_idx[order]) != 0])
+
+    totals = []
+    for i in range(0, len(rulesets), RULESET_BATCH):
+        batch = rulesets[i:i + RULESET_BATCH]
+        placement_table = np.array([r.placement_points for r in batch])
+        threshold = np.array([r.coin_threshold for r in batch])[:, None]
+        threshold_max = np.array([r.coin_threshold_max for r in batch])[:, None]
+        threshold_pts = np.array([r.coin_threshold_points for r in batch])[:, None]
+        weights = np.array([[getattr(r, f) for _, f in LINEAR_FEATURES] for r in batch])
+
+        scores = (
+            placement_table[:, placement_idx]
+            + np.minimum(coins[None, :] // threshold, threshold_max) * threshold_pts
+            + weights @ linear.T
+        )
+        totals.append(np.add.reduceat(scores[:, order], starts, axis=1))
+    return groups, np.concatenate(totals, axis=0)
+
+
+def _group_index(features):
+    keys = features[["league", "player"]]
+    groups = keys.drop_duplicates().reset_index(drop=True)
+    lookup = {tuple(k): i for i, k in enumerate(groups.itertuples(index=False))}
+    group_idx = np.array([lookup[k] for k in keys.itertuples(index=False, name=None)])
+    return groups, group_idx
+
+
+def rank_within_leagues(groups, totals):
+    """
+    Standard competition ranks (1,2,2,4) within each league, per ruleset.
+    Same shape as totals.
+    """
+    ranks = np.empty_like(totals)
+    for _, idx in groups.groupby("league").indices.items():
+        t = totals[:, idx]
+        ranks[:, idx] = 1 + (t[:, None, :] > t[:, :, None]).sum(axis=2)
+    return ranks
+
+
+def replay(rulesets, session_ids, backend=None):
+    """
+    Re-score the leagues' history under each ruleset. The current rules
+    are always scored as the baseline, under BASELINE_NAME; ruleset names
+    must be unique and may not reuse it.
+
+    Returns one row per (ruleset, league, player) with total, rank and
+    the change against the baseline.
+    """
+    names = [BASELINE_NAME] + [r.name for r in rulesets]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        raise ValueError(
+            f"Duplicate ruleset names: {', '.join(duplicates)} "
+            f"({BASELINE_NAME!r} is reserved for the current rules)."
+        )
+    all_rulesets = [Ruleset(BASELINE_NAME)] + list(rulesets)
+
+    features = load_features(session_ids, backend)
+    if features.empty:
+        return pd.DataFrame()
+    groups, totals = score_rulesets(features, all_rulesets)
+    ranks = rank_within_leagues(groups, totals)
+
+    frames = []
+    for i, ruleset in enumerate(all_rulesets):
+        frame = groups.rename(columns={"league": "League", "player": "Player"})
+        frame.insert(0, "Ruleset", ruleset.name)
+        frame["Total Points"] = totals[i]
+        frame["Rank"] = ranks[i]
+        frame["Points Change"] = totals[i] - totals[0]
+        frame["Rank Change"] = ranks[0] - ranks[i]
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def summarize(report):
+    """Per ruleset: leagues whose winner changes, and mean absolute rank change."""
+    winners = (
+        report[report["Rank"] == 1]
+        .groupby(["Ruleset", "League"], sort=False)["Player"]
+        .agg(frozenset)
+    )
+    baseline = winners[BASELINE_NAME]
+
+    summary = report.groupby("Ruleset", sort=False).agg(
+        mean_abs_rank_change=("Rank Change", lambda s: s.abs().mean()),
+        players_moved=("Rank Change", lambda s: int((s != 0).sum())),
+    )
+    summary["leagues_new_winner"] = [
+        sum(w != baseline[league] for league, w in winners[name].items())
+        for name in summary.index
+    ]
+    return summary.reset_index()
+
+
+def load_rulesets(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [Ruleset.from_dict(data) for data in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay stored games under alternative rulesets.")
+    parser.add_argument("rulesets", help="JSON file with a list of rulesets")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--league", action="append", help="League (session_id) to replay; repeatable")
+    target.add_argument("--all", action="store_true", help="Replay every league in storage")
+    parser.add_argument("--out", help="Write the full per-player report to this CSV")
+    args = parser.parse_args(argv)
+
+    backend = get_backend()
+    session_ids = backend.list_sessions() if args.all else args.league
+    report = replay(load_rulesets(args.rulesets), session_ids, backend)
+    if report.empty:
+        print("No games found.")
+        return
+
+    print(summarize(report).to_string(index=False))
+    if args.out:
+        report.to_csv(args.out, index=False)
+        print(f"report: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 # score_calculator.py
 import streamlit as st
-from supabase_db import load_games, save_game
+
+from metrics import timed
+from season_store import get_season, get_store
+from storage_backends import get_backend
 
 
 # ========= RULESET (single-game scoring) =========
@@ -9,10 +12,48 @@ BONUS_STAR_POINTS = 2
 COIN_THRESHOLD_POINTS = 1
 COIN_THRESHOLD = 30
 COIN_THRESHOLD_MAX = 3
+MOST_COINS_POINTS = 2
+LEAST_COINS_POINTS = -1
+MOST_ITEMS_POINTS = 1
+MOST_SPACES_POINTS = 1
 MINIGAME_MOST_WINS_POINTS = 3
 MINIGAME_SECOND_WINS_POINTS = 1
 
 
+def minigame_awards(results, players):
+    """
+    {player: (most_wins, second_most_wins)} for one game's results.
+
+    Games saved by this page carry the minigame_most_wins /
+    minigame_second_wins flags. Older games only have minigame_wins
+    counts; those are ranked instead, and only when no flags are present.
+    """
+    if any(
+        "minigame_most_wins" in results[p] or "minigame_second_wins" in results[p]
+        for p in players
+    ):
+        return {
+            p: (
+                bool(results[p].get("minigame_most_wins", False)),
+                bool(results[p].get("minigame_second_wins", False)),
+            )
+            for p in players
+        }
+
+    mg_wins = {p: int(results[p].get("minigame_wins", 0)) for p in players}
+    sorted_unique_mg = sorted(set(mg_wins.values()), reverse=True)
+    top_mg = sorted_unique_mg[0] if sorted_unique_mg else 0
+    second_mg = sorted_unique_mg[1] if len(sorted_unique_mg) > 1 else 0
+    return {
+        p: (
+            top_mg > 0 and mg_wins[p] == top_mg,
+            top_mg > 0 and second_mg > 0 and mg_wins[p] == second_mg,
+        )
+        for p in players
+    }
+
+
+@timed("scoring.compute_game_points")
 def compute_game_points(game, players):
     """
     Compute total points per player for THIS game only.
@@ -51,32 +92,37 @@ def compute_game_points(game, players):
 
     for p in players:
         if coin_values[p] == max_coins and max_coins > 0:
-            points[p] += 2
+            points[p] += MOST_COINS_POINTS
     for p in players:
         if coin_values[p] == min_coins:
-            points[p] -= 1
+            points[p] += LEAST_COINS_POINTS
 
     # --- Items & movement ---
     for p in players:
         if results[p].get("most_items_used", False):
-            points[p] += 1
+            points[p] += MOST_ITEMS_POINTS
         if results[p].get("most_spaces_travelled", False):
-            points[p] += 1
+            points[p] += MOST_SPACES_POINTS
 
     # --- Minigame wins: most +3, second-most +1 ---
-    for p in players:
-        if results[p].get("minigame_most_wins", False):
+    for p, (most, second) in minigame_awards(results, players).items():
+        if most:
             points[p] += MINIGAME_MOST_WINS_POINTS
-        if results[p].get("minigame_second_wins", False):
+        if second:
             points[p] += MINIGAME_SECOND_WINS_POINTS
 
     return points
 
 
+@timed("page.score_calculator")
 def score_calculator_page(players):
     st.header("Enter Game Results")
 
-    game_id = st.session_state.next_game_id
+    # The draft keeps its id (and so its widget keys) across reruns, even
+    # if another session saves a game in this league meanwhile.
+    if "draft_game_id" not in st.session_state:
+        st.session_state.draft_game_id = get_season(st.session_state.session_id).next_game_id
+    game_id = st.session_state.draft_game_id
     st.subheader(f"Game {game_id}")
 
     cols = st.columns(len(players))
@@ -188,8 +234,10 @@ def score_calculator_page(players):
         game_points = compute_game_points(game, players)
         game["points"] = game_points
 
-        st.session_state.games.append(game)
-        st.session_state.next_game_id += 1
+        season = get_store().publish(st.session_state.session_id, game)
+        st.session_state.season_version = season.version
+        st.session_state.draft_game_id = season.next_game_id
+        game_id = game["game_id"] = season.games[-1]["game_id"]
 
         st.success(f"Game {game_id} saved!")
 
@@ -205,23 +253,25 @@ def score_calculator_page(players):
                     value=f"{game_points[player]} pts",
                 )
 
+        backend = get_backend()
         try:
-            save_game(
+            backend.save_game(
                 session_id=st.session_state.session_id,
-                game_id=str(game_id),
+                game_id=game_id,
                 payload=game,
             )
         except Exception as exc:
-            st.error(f"Supabase save failed: {exc}")
+            st.error(f"{backend.name} save failed: {exc}")
 
-    # -------- Supabase debug (collapsed) --------
+    # -------- Storage debug (collapsed) --------
     with st.expander("Saved games (debug)"):
+        backend = get_backend()
         try:
-            saved = load_games(st.session_state.session_id)
+            saved = backend.load_games(st.session_state.session_id)
             st.write(f"Total saved: {len(saved)}")
             for row in sorted(saved, key=lambda g: g.get("game_id", 0)):
                 label = row.get("created_at") or f"ID {row.get('id', 'n/a')}"
                 with st.expander(f"{label} — Game {row['game_id']}"):
                     st.json(row["payload"])
         except Exception as exc:
-            st.error(f"Supabase load failed: {exc}")
+            st.error(f"{backend.name} load failed: {exc}")
@@ -4,17 +4,28 @@ import pandas as pd
 
 from score_calculator import (
     compute_game_points,
+    minigame_awards,
     PLACEMENT_POINTS,
     BONUS_STAR_POINTS,
     COIN_THRESHOLD_POINTS,
     COIN_THRESHOLD,
     COIN_THRESHOLD_MAX,
+    MOST_COINS_POINTS,
+    LEAST_COINS_POINTS,
+    MOST_ITEMS_POINTS,
+    MOST_SPACES_POINTS,
     MINIGAME_MOST_WINS_POINTS,
     MINIGAME_SECOND_WINS_POINTS,
 )
+import standings_cache
 from consistency import compute_consistency_bonuses
+from metrics import timed, timer
+from season_store import get_season
 
+RANK_EMOJIS = {1: "🥇", 2: "🥈", 3: "🥉", 4: "4️⃣"}
 
+
+@timed("scoring.compute_game_points_breakdown")
 def compute_game_points_breakdown(game, players):
     """
     Return a detailed breakdown of points per rule, per player, for ONE game.
@@ -26,8 +37,7 @@ def compute_game_points_breakdown(game, players):
     max_coins = max(coin_values.values())
     min_coins = min(coin_values.values())
 
-    mg_wins = {p: int(results[p].get("minigame_wins", 0)) for p in players}
-    sorted_unique_mg = sorted(set(mg_wins.values()), reverse=True)
+    minigames = minigame_awards(results, players)
 
     for p in players:
         r = results[p]
@@ -45,23 +55,18 @@ def compute_game_points_breakdown(game, players):
         coin_most_pts = 0
         coin_least_pts = 0
         if coin_values[p] == max_coins and max_coins > 0:
-            coin_most_pts = 2
+            coin_most_pts = MOST_COINS_POINTS
         if coin_values[p] == min_coins:
-            coin_least_pts = -1
-
-        items_pts = 1 if r.get("most_items_used", False) else 0
-        spaces_pts = 1 if r.get("most_spaces_travelled", False) else 0
-
-        minigame_pts = 0
-        if sorted_unique_mg and sorted_unique_mg[0] > 0:
-            if mg_wins[p] == sorted_unique_mg[0]:
-                minigame_pts += MINIGAME_MOST_WINS_POINTS
-            elif (
-                len(sorted_unique_mg) > 1
-                and sorted_unique_mg[1] > 0
-                and mg_wins[p] == sorted_unique_mg[1]
-            ):
-                minigame_pts += MINIGAME_SECOND_WINS_POINTS
+            coin_least_pts = LEAST_COINS_POINTS
+
+        items_pts = MOST_ITEMS_POINTS if r.get("most_items_used", False) else 0
+        spaces_pts = MOST_SPACES_POINTS if r.get("most_spaces_travelled", False) else 0
+
+        mg_most, mg_second = minigames[p]
+        minigame_pts = (
+            mg_most * MINIGAME_MOST_WINS_POINTS
+            + mg_second * MINIGAME_SECOND_WINS_POINTS
+        )
 
         base_total = (
             placement_pts
@@ -111,7 +116,7 @@ def assign_ranks(total_points_by_player):
     return ranks
 
 
-def build_streamlit_cumulative_chart(games_sorted, players):
+def build_progression_df(games_sorted, players):
     running_totals = {p: 0 for p in players}
     chart_rows = []
 
@@ -127,63 +132,94 @@ def build_streamlit_cumulative_chart(games_sorted, players):
         chart_rows.append(row)
 
     if not chart_rows:
+        return None
+    return pd.DataFrame(chart_rows).set_index("Game")
+
+
+def build_streamlit_cumulative_chart(progression_df):
+    if progression_df is None:
         st.info("No games available for chart yet.")
         return
 
-    df = pd.DataFrame(chart_rows).set_index("Game")
     st.subheader("Points Progression")
-    st.line_chart(df)
+    with timer("render.progression_chart"):
+        st.line_chart(progression_df)
 
 
-def scoreboard_page(players):
-    st.header("Scoreboard")
+def game_breakdown_rows(game, players):
+    """
+    Rows of the per-game breakdown table for ONE game, one per player
+    (before consistency bonuses).
+    """
+    results = game["results"]
+    breakdown = compute_game_points_breakdown(game, players)
+
+    rows = []
+    for p in players:
+        br = breakdown[p]
+        rows.append({
+            "Game": game["game_id"],
+            "Player": p,
+            "Place": int(results[p]["placement"]),
+            "Placement": br["placement_pts"],
+            "Bonus Stars": br["bonus_star_pts"],
+            "Coin Threshold": br["coin_threshold_pts"],
+            "Most Coins": br["coin_most_pts"],
+            "Least Coins": br["coin_least_pts"],
+            "Items": br["items_pts"],
+            "Spaces": br["spaces_pts"],
+            "Minigames": br["minigame_pts"],
+            "Game Total": br["base_total"],
+        })
+    return rows
 
-    games = st.session_state.games
 
-    if not games:
-        st.info("No games recorded yet. Add a game on the Calculate Scores page.")
-        return
+def build_standings(players, base_totals, wins, podiums, consistency_totals):
+    """
+    Final totals, ranks and the detailed standings rows, in rank order.
+    Returns (standings_rows, ranks, final_totals, sorted_players).
+    """
+    final_totals = {
+        p: base_totals[p] + consistency_totals.get(p, 0) for p in players
+    }
+    ranks = assign_ranks(final_totals)
+    sorted_players = sorted(players, key=lambda p: ranks[p])
 
+    standings_rows = []
+    for p in sorted_players:
+        standings_rows.append({
+            "Rank": RANK_EMOJIS.get(ranks[p], str(ranks[p])),
+            "Player": p,
+            "Wins": wins[p],
+            "Podiums": podiums[p],
+            "Base Points": base_totals[p],
+            "Consistency Bonus": consistency_totals.get(p, 0),
+            "Total Points": final_totals[p],
+        })
+    return standings_rows, ranks, final_totals, sorted_players
+
+
+@timed("scoreboard.compute_standings")
+def compute_standings(games, players):
+    """
+    Derive everything the scoreboard shows from the raw games.
+    No Streamlit calls, so the result can be cached and shared.
+    """
     base_totals = {p: 0 for p in players}
     per_game_rows = []
     wins = {p: 0 for p in players}
     podiums = {p: 0 for p in players}
 
     games_sorted = sorted(games, key=lambda g: g.get("game_id", 0))
-    total_games = len(games_sorted)
-    games_remaining = max(0, 10 - total_games)
-
-    build_streamlit_cumulative_chart(games_sorted, players)
 
     for g in games_sorted:
-        game_id = g["game_id"]
-        results = g["results"]
-        breakdown = compute_game_points_breakdown(g, players)
-
-        for p in players:
-            pl = int(results[p]["placement"])
-            br = breakdown[p]
-            base_totals[p] += br["base_total"]
-
-            if pl == 1:
+        for row in game_breakdown_rows(g, players):
+            p = row["Player"]
+            base_totals[p] += row["Game Total"]
+            if row["Place"] == 1:
                 wins[p] += 1
-            if pl in (1, 2, 3):
+            if row["Place"] in (1, 2, 3):
                 podiums[p] += 1
-
-            row = {
-                "Game": game_id,
-                "Player": p,
-                "Place": pl,
-                "Placement": br["placement_pts"],
-                "Bonus Stars": br["bonus_star_pts"],
-                "Coin Threshold": br["coin_threshold_pts"],
-                "Most Coins": br["coin_most_pts"],
-                "Least Coins": br["coin_least_pts"],
-                "Items": br["items_pts"],
-                "Spaces": br["spaces_pts"],
-                "Minigames": br["minigame_pts"],
-                "Game Total": br["base_total"],
-            }
             per_game_rows.append(row)
 
     # ---------- Consistency bonuses ----------
@@ -191,55 +227,89 @@ def scoreboard_page(players):
         games_sorted, players
     )
 
-    # ---------- Final totals & ranks ----------
-    final_totals = {
-        p: base_totals[p] + consistency_totals.get(p, 0) for p in players
+    # ---------- Final totals, ranks & standings table ----------
+    standings_rows, ranks, final_totals, sorted_players = build_standings(
+        players, base_totals, wins, podiums, consistency_totals
+    )
+    standings_df = pd.DataFrame(standings_rows).reset_index(drop=True)
+
+    # ---------- Per-game breakdown ----------
+    for row in per_game_rows:
+        gid = row["Game"]
+        p = row["Player"]
+        cb = per_game_consistency.get(p, {}).get(gid, 0)
+        row["Consistency"] = cb
+        row["Total"] = row["Game Total"] + cb
+    breakdown_df = pd.DataFrame(per_game_rows).sort_values(["Game", "Player"])
+
+    return {
+        "total_games": len(games_sorted),
+        "sorted_players": sorted_players,
+        "ranks": ranks,
+        "wins": wins,
+        "podiums": podiums,
+        "consistency_totals": consistency_totals,
+        "final_totals": final_totals,
+        "standings_df": standings_df,
+        "breakdown_df": breakdown_df,
+        "progression_df": build_progression_df(games_sorted, players),
     }
-    ranks = assign_ranks(final_totals)
 
-    rank_emojis = {1: "🥇", 2: "🥈", 3: "🥉", 4: "4️⃣"}
-    sorted_players = sorted(players, key=lambda p: ranks[p])
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _standings_for_version(league, version, players, _season):
+    # One computation per (league, season version), shared by all sessions.
+    # The Season itself is left unhashed; league + version identify it.
+    # Behind that, snapshots persist on disk across restarts.
+    return standings_cache.get_or_compute(
+        _season.games, list(players), compute_standings
+    )
+
+
+@timed("page.scoreboard")
+def scoreboard_page(players):
+    st.header("Scoreboard")
+
+    season = get_season(st.session_state.session_id)
+
+    if not season.games:
+        st.info("No games recorded yet. Add a game on the Calculate Scores page.")
+        return
+
+    standings = _standings_for_version(
+        season.league, season.version, tuple(players), season
+    )
+    total_games = standings["total_games"]
+    games_remaining = max(0, 10 - total_games)
+    sorted_players = standings["sorted_players"]
+    ranks = standings["ranks"]
+    final_totals = standings["final_totals"]
+    consistency_totals = standings["consistency_totals"]
+
+    build_streamlit_cumulative_chart(standings["progression_df"])
 
     # ---------- Metric cards ----------
     st.subheader(f"Overall Standings — Game {total_games} of 10  ({games_remaining} to go)")
     metric_cols = st.columns(len(players))
     for i, p in enumerate(sorted_players):
         with metric_cols[i]:
-            rank_label = rank_emojis.get(ranks[p], f"{ranks[p]}th")
+            rank_label = RANK_EMOJIS.get(ranks[p], f"{ranks[p]}th")
             st.metric(
                 label=f"{rank_label} {p}",
                 value=f"{final_totals[p]} pts",
-                help=f"Wins: {wins[p]}  |  Podiums: {podiums[p]}  |  Consistency bonus: +{consistency_totals.get(p, 0)}",
+                help=f"Wins: {standings['wins'][p]}  |  Podiums: {standings['podiums'][p]}  |  Consistency bonus: +{consistency_totals.get(p, 0)}",
             )
 
     # ---------- Detailed standings table ----------
     st.subheader("Detailed Standings")
-    standings_rows = []
-    for p in sorted_players:
-        standings_rows.append({
-            "Rank": rank_emojis.get(ranks[p], str(ranks[p])),
-            "Player": p,
-            "Wins": wins[p],
-            "Podiums": podiums[p],
-            "Base Points": base_totals[p],
-            "Consistency Bonus": consistency_totals.get(p, 0),
-            "Total Points": final_totals[p],
-        })
-
-    standings_df = pd.DataFrame(standings_rows).reset_index(drop=True)
-    st.dataframe(standings_df, use_container_width=True, hide_index=True)
+    standings_df = standings["standings_df"]
+    with timer("render.standings_table"):
+        st.dataframe(standings_df, use_container_width=True, hide_index=True)
 
     # ---------- Per-game breakdown ----------
     st.subheader("Per-game breakdown")
-    for row in per_game_rows:
-        gid = row["Game"]
-        p = row["Player"]
-        cb = per_game_consistency.get(p, {}).get(gid, 0)
-        row["Consistency"] = cb
-        row["Total"] = row["Game Total"] + cb
-
-    breakdown_df = pd.DataFrame(per_game_rows).sort_values(["Game", "Player"])
-    st.dataframe(breakdown_df, use_container_width=True, hide_index=True)
+    with timer("render.breakdown_table"):
+        st.dataframe(standings["breakdown_df"], use_container_width=True, hide_index=True)
 
-    # Expose standings for summary page
+    # Expose standings for summary page (a reference to the shared frame)
     st.session_state.current_standings = standings_df
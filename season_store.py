@@ -0,0 +1,109 @@
+# season_store.py
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import streamlit as st
+
+
+def freeze(value):
+    """
+    Return a deep, read-only copy of a JSON-like value.
+    dicts become MappingProxyType, lists become tuples.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class Season:
+    """
+    One immutable version of a league's games, shared by every session
+    watching that league. Writes produce a new Season with version + 1.
+    `degraded` marks games taken from the local fallback because the
+    storage backend couldn't be reached.
+    """
+    league: str
+    version: int
+    games: tuple
+    degraded: bool = False
+
+    @property
+    def next_game_id(self):
+        if not self.games:
+            return 1
+        return max(g.get("game_id", 0) for g in self.games) + 1
+
+
+class SeasonStore:
+    """Process-wide map of league -> latest Season."""
+
+    # How long a degraded league waits before the backend is tried again
+    RETRY_SECONDS = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seasons = {}
+        self._loaded_at = {}
+
+    def get(self, league):
+        return self._seasons.get(league)
+
+    def needs_load(self, league):
+        """
+        Whether the league should be fetched from the backend: it was never
+        loaded, or it was loaded degraded and RETRY_SECONDS have passed.
+        """
+        season = self._seasons.get(league)
+        if season is None:
+            return True
+        return season.degraded and (
+            time.monotonic() - self._loaded_at[league] >= self.RETRY_SECONDS
+        )
+
+    def load(self, league, games, degraded=False):
+        """
+        Install the Season for a league. If another session already
+        loaded it, keep theirs, unless theirs is degraded and these games
+        came from the backend.
+        """
+        with self._lock:
+            season = self._seasons.get(league)
+            if season is None or (season.degraded and not degraded):
+                version = season.version + 1 if season else 1
+                season = Season(league, version, freeze(games), degraded)
+                self._seasons[league] = season
+            self._loaded_at[league] = time.monotonic()
+            return season
+
+    def publish(self, league, game):
+        """
+        Append one game, copy-on-write, and return the new Season.
+        If another session already took the game's game_id, the game is
+        renumbered to the next free id; read the id actually used from
+        season.games[-1].
+        """
+        with self._lock:
+            current = self._seasons.get(league) or Season(league, 0, ())
+            taken = {g.get("game_id") for g in current.games}
+            if game.get("game_id") in taken:
+                game = dict(game, game_id=current.next_game_id)
+            season = Season(
+                league, current.version + 1, current.games + (freeze(game),), current.degraded
+            )
+            self._seasons[league] = season
+            return season
+
+
+@st.cache_resource
+def get_store():
+    return SeasonStore()
+
+
+def get_season(league):
+    """Latest Season for a league (an empty version-0 Season if none yet)."""
+    return get_store().get(league) or Season(league, 0, ())
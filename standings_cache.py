@@ -0,0 +1,153 @@
+# standings_cache.py
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+import consistency
+import score_calculator
+from metrics import timed, timer
+
+CACHE_DIR = os.getenv("STANDINGS_CACHE_DIR", ".standings_cache")
+MAX_BYTES = int(os.getenv("STANDINGS_CACHE_MAX_BYTES", 100 * 2**20))
+MAX_AGE_SECONDS = int(os.getenv("STANDINGS_CACHE_MAX_AGE", 30 * 24 * 3600))
+# Temp files older than this were left by a writer that died mid-store
+TMP_MAX_AGE_SECONDS = 3600
+
+# Bump when the shape or derivation of the cached standings changes
+CACHE_VERSION = 1
+
+
+def ruleset_constants():
+    """Every UPPERCASE scoring constant, so a rule change misses the cache."""
+    return {
+        f"{module.__name__}.{name}": getattr(module, name)
+        for module in (score_calculator, consistency)
+        for name in dir(module)
+        if name.isupper()
+    }
+
+
+def cache_key(games, players):
+    """Hash of the league's games, the players and the active ruleset."""
+    blob = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "rules": ruleset_constants(),
+            "players": list(players),
+            "games": list(games),
+        },
+        sort_keys=True,
+        # Season games are read-only mappings
+        default=dict,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+
+def load(key):
+    """Cached standings for `key`, or None. A hit refreshes the entry's age."""
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            standings = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated, unreadable or from an incompatible version; drop it
+        _remove(path)
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        # Evicted meanwhile, or a read-only cache; the hit still counts
+        pass
+    return standings
+
+
+def store(key, standings):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # A temp file per call: session threads may store the same key at once
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{key}.", suffix=".tmp", dir=CACHE_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(standings, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _path(key))
+    except BaseException:
+        _remove(tmp_path)
+        raise
+    evict()
+
+
+def evict(max_bytes=None, max_age=None):
+    """
+    Remove entries not used within `max_age` seconds, then the least
+    recently used ones until the cache fits in `max_bytes`. Abandoned
+    temp files are removed too.
+    """
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    max_age = MAX_AGE_SECONDS if max_age is None else max_age
+    try:
+        names = os.listdir(CACHE_DIR)
+    except FileNotFoundError:
+        return
+
+    now = time.time()
+    entries = []
+    for name in names:
+        if not name.endswith((".pkl", ".tmp")):
+            continue
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if name.endswith(".tmp"):
+            if stat.st_mtime < now - TMP_MAX_AGE_SECONDS:
+                _remove(path)
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    cutoff = now - max_age
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        _remove(path)
+        total -= size
+
+
+def _remove(path):
+    # Already gone, or not ours to delete: either way, carry on
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@timed("standings_cache.get_or_compute")
+def get_or_compute(games, players, compute):
+    """
+    Standings for these games from disk if present, else `compute(games,
+    players)` stored for next time. Cache I/O failures fall back to computing.
+    """
+    with timer("standings_cache.key"):
+        key = cache_key(games, players)
+
+    standings = load(key)
+    if standings is not None:
+        return standings
+
+    standings = compute(games, players)
+    try:
+        store(key, standings)
+    except OSError:
+        # Read-only or full disk: still serve the fresh result
+        pass
+    return standings
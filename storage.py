@@ -1,10 +1,14 @@
 # storage.py
 import json
 import os
+import tempfile
+
+from metrics import timed
 
 DATA_FILE = "marioparty_data.json"
 
 
+@timed("storage.load_data")
 def load_data():
     """
     Load games + summaries from disk.
@@ -26,13 +30,40 @@ def load_data():
     return games, summaries
 
 
+@timed("storage.save_data")
 def save_data(games, summaries):
     """
     Save games + summaries to disk as JSON.
+    Written to a temp file and renamed, so a concurrent load_data never
+    sees a half-written (or empty) file.
     """
     data = {
         "games": games,
         "summaries": summaries,
     }
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(DATA_FILE)}.", suffix=".tmp",
+        dir=os.path.dirname(os.path.abspath(DATA_FILE)),
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, DATA_FILE)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def in_league(game, session_id):
+    """
+    Whether a game from the local file belongs to `session_id`.
+    Games saved before leagues were tagged belong to every league.
+    """
+    return game.get("session_id", session_id) == session_id
+
+
+def league_games(games, session_id):
+    return [g for g in games if in_league(g, session_id)]
@@ -0,0 +1,327 @@
+# storage_backends.py
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing
+
+from metrics import timed
+from storage import in_league, load_data, save_data
+
+SQLITE_FILE = "marioparty.db"
+# Seconds a connection waits for another writer's lock before failing
+SQLITE_TIMEOUT = 30
+
+
+class StorageBackend(ABC):
+    """
+    Where game payloads live. Rows returned by load_games follow the
+    Supabase shape, newest first: {"id", "game_id", "payload"}.
+    """
+
+    name = "storage"
+
+    @abstractmethod
+    def save_game(self, session_id, game_id, payload):
+        ...
+
+    @abstractmethod
+    def load_games(self, session_id, limit=50):
+        """Newest-first rows for one league; limit=None returns all."""
+
+    @abstractmethod
+    def list_sessions(self):
+        ...
+
+    @abstractmethod
+    def update_games(self, session_id, rows):
+        """
+        Replace the payloads of existing rows, as one batch.
+        rows: [{"id", "payload"}] with ids from load_games.
+        """
+
+    def iter_games(self, session_id, chunk_size=500):
+        """
+        Yield a league's game payloads in game_id order (ties in save
+        order), in lists of up to `chunk_size`. Every backend uses this
+        order, so consistency bonuses come out the same everywhere.
+        This default loads everything first; backends that can page
+        through storage override it.
+        """
+        rows = self.load_games(session_id, limit=None)
+        payloads = [row["payload"] for row in reversed(rows)]
+        payloads.sort(key=lambda g: g.get("game_id", 0))
+        for i in range(0, len(payloads), chunk_size):
+            yield payloads[i:i + chunk_size]
+
+    def iter_games_many(self, session_ids, chunk_size=500):
+        """
+        Yield (session_id, payloads) chunks for several leagues. Each
+        league's chunks come in iter_games order, but chunks of different
+        leagues may interleave. This default walks the leagues one at a time.
+        """
+        for session_id in session_ids:
+            for chunk in self.iter_games(session_id, chunk_size):
+                yield session_id, chunk
+
+
+class JsonFileBackend(StorageBackend):
+    """The local JSON file from storage.py, with games tagged by league."""
+
+    name = "Local file"
+
+    # Saves are read-modify-write of the whole file; serialize them so
+    # two sessions saving at once don't drop each other's game.
+    _write_lock = threading.Lock()
+
+    def save_game(self, session_id, game_id, payload):
+        with self._write_lock:
+            games, summaries = load_data()
+            games.append(dict(payload, session_id=session_id))
+            save_data(games, summaries)
+
+    def load_games(self, session_id, limit=50):
+        games, _ = load_data()
+        rows = [
+            {"id": i, "game_id": g.get("game_id"), "payload": g}
+            for i, g in enumerate(games, start=1)
+            if in_league(g, session_id)
+        ]
+        rows.reverse()
+        return rows if limit is None else rows[:limit]
+
+    def list_sessions(self):
+        games, _ = load_data()
+        return sorted({g["session_id"] for g in games if "session_id" in g})
+
+    def update_games(self, session_id, rows):
+        # Row ids are 1-based positions in the file
+        with self._write_lock:
+            games, summaries = load_data()
+            for row in rows:
+                games[row["id"] - 1] = row["payload"]
+            save_data(games, summaries)
+
+
+class SupabaseBackend(StorageBackend):
+    """The `mario_scores` table, via supabase_db."""
+
+    name = "Supabase"
+    page_size = 1000
+    fan_out = 10  # leagues paged concurrently by iter_games_many
+    # The game_id column is text and would sort "10" before "2"; the
+    # payload's game_id is a JSON number and sorts numerically.
+    game_order = "payload->game_id.asc,id.asc"
+
+    def save_game(self, session_id, game_id, payload):
+        from supabase_db import save_game
+
+        return save_game(session_id=session_id, game_id=str(game_id), payload=payload)
+
+    def load_games(self, session_id, limit=50):
+        from supabase_db import load_games
+
+        if limit is not None:
+            return load_games(session_id, limit)
+
+        rows = []
+        while True:
+            page = load_games(session_id, self.page_size, len(rows))
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+
+    def list_sessions(self):
+        from supabase_db import list_sessions
+
+        return list_sessions()
+
+    def update_games(self, session_id, rows):
+        from supabase_db import update_payloads
+
+        return update_payloads(rows)
+
+    def iter_games(self, session_id, chunk_size=500):
+        from supabase_db import load_games
+
+        offset = 0
+        while True:
+            rows = load_games(session_id, chunk_size, offset, self.game_order)
+            if rows:
+                yield [row["payload"] for row in rows]
+            if len(rows) < chunk_size:
+                return
+            offset += chunk_size
+
+    def iter_games_many(self, session_ids, chunk_size=500):
+        # Pages through `fan_out` leagues at a time, fetching the next page
+        # of each in one concurrent round over the pooled connections.
+        from supabase_db import load_games_many
+
+        session_ids = list(session_ids)
+        for i in range(0, len(session_ids), self.fan_out):
+            pending = session_ids[i:i + self.fan_out]
+            offset = 0
+            while pending:
+                pages = load_games_many(pending, chunk_size, offset, self.game_order)
+                for session_id in pending:
+                    if pages[session_id]:
+                        yield session_id, [row["payload"] for row in pages[session_id]]
+                pending = [sid for sid in pending if len(pages[sid]) == chunk_size]
+                offset += chunk_size
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Local SQLite database. Besides the raw payloads, each player's result
+    is normalized into `results`, indexed on (session_id, game_id, player),
+    so per-player results can be queried in SQL without decoding JSON.
+    """
+
+    name = "SQLite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_session
+            ON games (session_id, id);
+        CREATE INDEX IF NOT EXISTS idx_games_session_game
+            ON games (session_id, game_id, id);
+        CREATE TABLE IF NOT EXISTS results (
+            game_row INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+            session_id TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            player TEXT NOT NULL,
+            placement INTEGER NOT NULL,
+            bonus_stars INTEGER NOT NULL,
+            coins INTEGER NOT NULL,
+            points INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_results_session_game_player
+            ON results (session_id, game_id, player);
+        -- update_games and the ON DELETE CASCADE look rows up by game_row
+        CREATE INDEX IF NOT EXISTS idx_results_game_row_player
+            ON results (game_row, player);
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SQLITE_FILE", SQLITE_FILE)
+        with closing(self._connect()) as conn:
+            # WAL lets readers proceed while a write is in progress; the
+            # setting is stored in the database file.
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe to share
+        # across Streamlit's session threads. Writers from other threads
+        # or processes are waited for (busy timeout) rather than failing.
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @timed("sqlite.save_game")
+    def save_game(self, session_id, game_id, payload):
+        game_points = payload.get("points", {})
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute(
+                "INSERT INTO games (session_id, game_id, payload) VALUES (?, ?, ?)",
+                (session_id, int(game_id), json.dumps(payload)),
+            )
+            conn.executemany(
+                "INSERT INTO results (game_row, session_id, game_id, player,"
+                " placement, bonus_stars, coins, points)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        cur.lastrowid,
+                        session_id,
+                        int(game_id),
+                        player,
+                        int(r["placement"]),
+                        int(r.get("bonus_stars", 0)),
+                        int(r.get("coins", 0)),
+                        int(game_points.get(player, 0)),
+                    )
+                    for player, r in payload["results"].items()
+                ],
+            )
+
+    @timed("sqlite.load_games")
+    def load_games(self, session_id, limit=50):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, game_id, payload FROM games WHERE session_id = ?"
+                " ORDER BY id DESC LIMIT ?",
+                (session_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [
+            {"id": row_id, "game_id": game_id, "payload": json.loads(payload)}
+            for row_id, game_id, payload in rows
+        ]
+
+    def list_sessions(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT session_id FROM games ORDER BY session_id"
+            ).fetchall()
+        return [session_id for (session_id,) in rows]
+
+    @timed("sqlite.update_games")
+    def update_games(self, session_id, rows):
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE games SET payload = ? WHERE id = ? AND session_id = ?",
+                [(json.dumps(row["payload"]), row["id"], session_id) for row in rows],
+            )
+            conn.executemany(
+                "UPDATE results SET points = ? WHERE game_row = ? AND player = ?",
+                [
+                    (int(points), row["id"], player)
+                    for row in rows
+                    for player, points in row["payload"].get("points", {}).items()
+                ],
+            )
+
+    def iter_games(self, session_id, chunk_size=500):
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "SELECT payload FROM games WHERE session_id = ?"
+                " ORDER BY game_id, id",
+                (session_id,),
+            )
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield [json.loads(payload) for (payload,) in rows]
+
+
+BACKENDS = {
+    "supabase": SupabaseBackend,
+    "json": JsonFileBackend,
+    "sqlite": SqliteBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """
+    The configured backend, chosen by STORAGE_BACKEND
+    ("supabase" by default, "json" or "sqlite"). One instance per process.
+    """
+    global _backend
+    if _backend is None:
+        name = os.getenv("STORAGE_BACKEND", "supabase").lower()
+        if name not in BACKENDS:
+            raise ValueError(
+                f"Unknown STORAGE_BACKEND {name!r}. Use one of: {', '.join(BACKENDS)}."
+            )
+        _backend = BACKENDS[name]()
+    return _backend
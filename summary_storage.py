@@ -2,7 +2,11 @@
 import streamlit as st
 import pandas as pd
 
+from export import FORMATS, export_zip
+from metrics import timed
 
+
+@timed("page.summary_storage")
 def summary_storage_page(players):
     st.header("Summary Sheets")
 
@@ -30,6 +34,32 @@ def summary_storage_page(players):
 
     st.markdown("---")
 
+    # Export standings, per-game breakdown and summaries
+    st.subheader("Export")
+
+    league = st.session_state.session_id
+    fmt = st.radio("Format", FORMATS, horizontal=True, key="export_format")
+
+    if st.button("📦 Prepare export"):
+        try:
+            st.session_state.export_file = (
+                f"marioparty_{league}_{fmt}.zip",
+                export_zip([league], fmt, players, summaries),
+            )
+        except Exception as exc:
+            st.error(f"Export failed: {exc}")
+
+    if "export_file" in st.session_state:
+        file_name, data = st.session_state.export_file
+        st.download_button(
+            "⬇️ Download export",
+            data=data,
+            file_name=file_name,
+            mime="application/zip",
+        )
+
+    st.markdown("---")
+
     # List existing summaries
     st.subheader("Saved summaries")
 
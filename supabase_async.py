@@ -0,0 +1,155 @@
+# supabase_async.py
+import asyncio
+import threading
+
+import httpx
+
+TABLE = "mario_scores"
+
+
+def _raise_for_status(response, action: str):
+    if response.status_code >= 400:
+        raise RuntimeError(f"Supabase {action} failed: {response.text}")
+    return response
+
+
+class AsyncSupabase:
+    """
+    Minimal asyncio client for the `mario_scores` table over Supabase's
+    REST (PostgREST) API. All calls share one pooled keep-alive
+    connection set, so concurrent requests reuse open sockets.
+
+    `url` is the project URL (or a local stub server for testing).
+    """
+
+    def __init__(self, url: str, key: str, max_connections: int = 10, timeout: float = 10.0):
+        self._base_url = f"{url.rstrip('/')}/rest/v1"
+        self._headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+        }
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self._timeout = timeout
+        self._client = None
+
+    def _http(self):
+        # Created lazily so the client binds to the loop that first uses it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=self._headers,
+                limits=self._limits,
+                timeout=self._timeout,
+            )
+        return self._client
+
+    async def save_game(self, session_id: str, game_id: str, payload: dict):
+        res = await self._http().post(
+            f"/{TABLE}",
+            json={"session_id": session_id, "game_id": game_id, "payload": payload},
+            headers={"Prefer": "return=representation"},
+        )
+        return _raise_for_status(res, "insert").json()
+
+    async def load_games(self, session_id: str, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+        res = await self._http().get(
+            f"/{TABLE}",
+            params={
+                "select": "id,game_id,payload",
+                "session_id": f"eq.{session_id}",
+                "order": order,
+                "limit": str(limit),
+                "offset": str(offset),
+            },
+        )
+        return _raise_for_status(res, "load").json()
+
+    async def list_sessions(self, page_size: int = 1000):
+        """All distinct session_ids, paging through the session_id column."""
+        sessions = set()
+        offset = 0
+        while True:
+            res = await self._http().get(
+                f"/{TABLE}",
+                params={
+                    "select": "session_id",
+                    "order": "id.asc",
+                    "limit": str(page_size),
+                    "offset": str(offset),
+                },
+            )
+            rows = _raise_for_status(res, "list").json()
+            sessions.update(row["session_id"] for row in rows)
+            if len(rows) < page_size:
+                return sorted(sessions)
+            offset += page_size
+
+    async def update_payload(self, row_id: int, payload: dict):
+        res = await self._http().patch(
+            f"/{TABLE}",
+            params={"id": f"eq.{row_id}"},
+            json={"payload": payload},
+        )
+        return _raise_for_status(res, "update")
+
+    async def update_payloads(self, rows):
+        """Rewrite several rows' payloads concurrently. rows: [{"id", "payload"}]."""
+        await asyncio.gather(
+            *(self.update_payload(row["id"], row["payload"]) for row in rows)
+        )
+
+    async def load_games_many(self, session_ids, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+        """Load the same page of several leagues concurrently. Returns {session_id: rows}."""
+        session_ids = list(session_ids)
+        results = await asyncio.gather(
+            *(self.load_games(sid, limit, offset, order) for sid in session_ids)
+        )
+        return dict(zip(session_ids, results))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class SupabasePool:
+    """
+    Blocking facade over AsyncSupabase for the Streamlit pages.
+    Owns a private event loop on a daemon thread, so the pooled
+    connections stay open across reruns and sessions.
+    """
+
+    def __init__(self, url: str, key: str, **kwargs):
+        self.client = AsyncSupabase(url, key, **kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coro):
+        """Run a coroutine on the pool's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def save_game(self, session_id: str, game_id: str, payload: dict):
+        return self.run(self.client.save_game(session_id, game_id, payload))
+
+    def load_games(self, session_id: str, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+        return self.run(self.client.load_games(session_id, limit, offset, order))
+
+    def load_games_many(self, session_ids, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+        return self.run(self.client.load_games_many(session_ids, limit, offset, order))
+
+    def list_sessions(self):
+        return self.run(self.client.list_sessions())
+
+    def update_payloads(self, rows):
+        return self.run(self.client.update_payloads(rows))
+
+    def close(self):
+        self.run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
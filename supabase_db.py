@@ -1,19 +1,19 @@
 import os
 
 import streamlit as st
-from supabase import create_client
 
-def _get_secret(name: str):
-    if name in st.secrets:
-        return st.secrets[name]
-    return os.getenv(name)
+from metrics import timed
+from supabase_async import SupabasePool
 
 
-def _raise_for_error(response, action: str):
-    error = getattr(response, "error", None)
-    if error:
-        raise RuntimeError(f"Supabase {action} failed: {error}")
-    return response
+def _get_secret(name: str):
+    try:
+        if name in st.secrets:
+            return st.secrets[name]
+    except Exception:
+        # No secrets.toml (e.g. headless scripts); use the environment
+        pass
+    return os.getenv(name)
 
 
 @st.cache_resource
@@ -25,26 +25,26 @@ def get_supabase():
             "Supabase credentials missing. Set SUPABASE_URL and "
             "SUPABASE_SERVICE_ROLE_KEY (or SUPABASE_ANON_KEY)."
         )
-    return create_client(url, key)
+    return SupabasePool(url, key)
 
+@timed("supabase.save_game")
 def save_game(session_id: str, game_id: str, payload: dict):
-    sb = get_supabase()
-    res = sb.table("mario_scores").insert({
-        "session_id": session_id,
-        "game_id": game_id,
-        "payload": payload
-    }).execute()
-    return _raise_for_error(res, "insert")
-
-def load_games(session_id: str, limit: int = 50):
-    sb = get_supabase()
-    res = (
-        sb.table("mario_scores")
-        .select("id, game_id, payload")
-        .eq("session_id", session_id)
-        .order("id", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    res = _raise_for_error(res, "load")
-    return getattr(res, "data", res)
+    return get_supabase().save_game(session_id, game_id, payload)
+
+@timed("supabase.load_games")
+def load_games(session_id: str, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+    return get_supabase().load_games(session_id, limit, offset, order)
+
+@timed("supabase.load_games_many")
+def load_games_many(session_ids, limit: int = 50, offset: int = 0, order: str = "id.desc"):
+    """Load the same page of several leagues concurrently over the shared connection pool."""
+    return get_supabase().load_games_many(session_ids, limit, offset, order)
+
+@timed("supabase.list_sessions")
+def list_sessions():
+    return get_supabase().list_sessions()
+
+@timed("supabase.update_payloads")
+def update_payloads(rows):
+    """Rewrite the payloads of existing rows, given as [{"id", "payload"}]."""
+    return get_supabase().update_payloads(rows)
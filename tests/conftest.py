@@ -0,0 +1,56 @@
+# tests/conftest.py
+import os
+import random
+import sys
+
+import pytest
+
+# The app is a flat set of modules at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+def random_game(rng, game_id, players=PLAYERS, legacy=False):
+    """
+    One game with random results and its points under the current rules,
+    shaped like score_calculator_page saves it: minigame winners are
+    flags from the two multiselects. legacy=True gives the older shape,
+    with minigame_wins counts and no flags.
+    """
+    from score_calculator import compute_game_points
+
+    placements = rng.sample(range(1, len(players) + 1), len(players))
+    most = rng.sample(players, rng.choice([0, 1, 1, 2]))
+    second = rng.sample(players, rng.choice([0, 1, 1, 2]))
+    results = {}
+    for i, p in enumerate(players):
+        r = {
+            "placement": placements[i],
+            "bonus_stars": rng.randint(0, 3),
+            "coins": rng.randint(0, 120),
+            "most_items_used": rng.random() < 0.25,
+            "most_spaces_travelled": rng.random() < 0.25,
+        }
+        if legacy:
+            r["minigame_wins"] = rng.randint(0, 5)
+        else:
+            r["minigame_most_wins"] = p in most
+            r["minigame_second_wins"] = p in second
+        results[p] = r
+    game = {"game_id": game_id, "results": results}
+    game["points"] = compute_game_points(game, players)
+    return game
+
+
+@pytest.fixture
+def rng():
+    return random.Random(2025)
+
+
+@pytest.fixture
+def make_season(rng):
+    """make_season(n, legacy=False) -> n random games with game_ids 1..n."""
+    def make(n, legacy=False):
+        return [random_game(rng, gid, legacy=legacy) for gid in range(1, n + 1)]
+    return make
@@ -0,0 +1,89 @@
+# tests/test_consistency.py
+import random
+
+from consistency import ConsistencyTracker, compute_consistency_bonuses
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+def reference_bonuses(games, players):
+    """The whole-season implementation ConsistencyTracker replaced."""
+    games_sorted = sorted(games, key=lambda g: g.get("game_id", 0))
+
+    placements = {p: [] for p in players}
+    for g in games_sorted:
+        gid = g.get("game_id")
+        results = g.get("results", {})
+        for p in players:
+            if p in results and "placement" in results[p]:
+                placements[p].append((gid, int(results[p]["placement"])))
+
+    per_game_bonus = {p: {gid: 0 for gid, _ in placements[p]} for p in players}
+
+    for p in players:
+        pl_list = placements[p]
+        n = len(pl_list)
+        for i in range(1, n):
+            if pl_list[i - 1][1] <= 2 and pl_list[i][1] <= 2:
+                per_game_bonus[p][pl_list[i][0]] += 2
+        for i in range(2, n):
+            if all(pl <= 2 for _, pl in pl_list[i - 2:i + 1]):
+                per_game_bonus[p][pl_list[i][0]] += 3
+        if n >= 5 and all(pl != 4 for _, pl in pl_list[0:5]):
+            per_game_bonus[p][pl_list[4][0]] += 2
+        if n >= 10 and all(pl != 4 for _, pl in pl_list[5:10]):
+            per_game_bonus[p][pl_list[9][0]] += 2
+
+    total_bonus = {p: sum(per_game_bonus[p].values()) for p in players}
+    return total_bonus, per_game_bonus
+
+
+def random_season(rng):
+    """Games with shuffled ids, in random order, some players sitting out."""
+    n = rng.randint(0, 14)
+    game_ids = rng.sample(range(1, 40), n)
+    games = []
+    for gid in game_ids:
+        playing = [p for p in PLAYERS if rng.random() < 0.9] or PLAYERS[:1]
+        placements = [rng.randint(1, 4) for _ in playing]
+        games.append({
+            "game_id": gid,
+            "results": {p: {"placement": pl} for p, pl in zip(playing, placements)},
+        })
+    return games
+
+
+def test_matches_reference_on_random_seasons():
+    rng = random.Random(7)
+    for _ in range(3000):
+        games = random_season(rng)
+        assert compute_consistency_bonuses(games, PLAYERS) == reference_bonuses(games, PLAYERS)
+
+
+def test_tracker_streams_in_chunks():
+    rng = random.Random(11)
+    for _ in range(200):
+        games = sorted(random_season(rng), key=lambda g: g["game_id"])
+        expected, _ = reference_bonuses(games, PLAYERS)
+
+        tracker = ConsistencyTracker(PLAYERS)
+        chunk = rng.randint(1, 4)
+        for i in range(0, len(games), chunk):
+            for g in games[i:i + chunk]:
+                tracker.add_game(g)
+        assert tracker.totals == expected
+
+
+def test_rules_fire_on_expected_games():
+    placements = [1, 2, 1, 3, 2, 4, 1, 1, 2, 3]
+    games = [
+        {"game_id": i, "results": {"Amber": {"placement": pl}}}
+        for i, pl in enumerate(placements, start=1)
+    ]
+    tracker = ConsistencyTracker(["Amber"])
+    fired = [tracker.add_game_rules(g)["Amber"] for g in games]
+
+    assert [b2b for b2b, _, _ in fired] == [False, True, True, False, False, False, False, True, True, False]
+    assert [three for _, three, _ in fired] == [False, False, True, False, False, False, False, False, True, False]
+    # Games 1-5 have no 4th place; games 6-10 do
+    assert fired[4][2] and not fired[9][2]
@@ -0,0 +1,41 @@
+# tests/test_export.py
+import pandas as pd
+
+from export import export
+from scoreboard import compute_standings
+from storage_backends import SqliteBackend
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+def test_csv_export_matches_scoreboard(tmp_path, make_season):
+    backend = SqliteBackend(str(tmp_path / "marioparty.db"))
+    seasons = {"a": make_season(13), "b": make_season(4)}
+    for league, games in seasons.items():
+        for g in reversed(games):
+            backend.save_game(league, g["game_id"], g)
+
+    summaries = [{"label": "Week 1", "standings": [{"Player": "Amber", "Total Points": 3}]}]
+    paths = export(["a", "b", "empty"], str(tmp_path / "out"), "csv",
+                   summaries=summaries, backend=backend, chunk_size=5)
+
+    standings = pd.read_csv(paths["standings"])
+    breakdown = pd.read_csv(paths["breakdown"])
+    assert set(standings["League"]) == {"a", "b"}
+    for league, games in seasons.items():
+        expected = compute_standings(games, PLAYERS)
+
+        got = standings[standings["League"] == league].drop(columns="League").reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected["standings_df"])
+
+        got = (
+            breakdown[breakdown["League"] == league]
+            .drop(columns="League")
+            .sort_values(["Game", "Player"])
+            .reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(got, expected["breakdown_df"].reset_index(drop=True))
+
+    assert pd.read_csv(paths["summaries"]).to_dict("records") == [
+        {"Summary": "Week 1", "Player": "Amber", "Total Points": 3}
+    ]
@@ -0,0 +1,106 @@
+# tests/test_metrics.py
+import socket
+import urllib.request
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_server", None)
+    monkeypatch.setattr(metrics, "_warned", set())
+
+
+def parse(text):
+    """{metric line name+labels: value} from the exposition text."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_samples_land_in_the_first_bucket_that_fits():
+    for seconds in (0.0005, 0.001, 0.003, 0.2, 99.0):
+        metrics.observe("op", seconds, league="l")
+
+    buckets, count, total = metrics._histograms[("op", "l")]
+    assert buckets[metrics.BUCKETS.index(0.001)] == 2
+    assert buckets[metrics.BUCKETS.index(0.005)] == 1
+    assert buckets[metrics.BUCKETS.index(0.25)] == 1
+    # Above the largest bound: only in +Inf
+    assert sum(buckets) == 4 and count == 5
+    assert total == pytest.approx(99.2045)
+
+
+def test_render_is_cumulative_with_inf_sum_and_count():
+    for seconds in (0.002, 0.02, 0.02, 20.0):
+        metrics.observe("page.scoreboard", seconds, league="friday")
+
+    samples = parse(metrics.render_prometheus())
+    labels = 'op="page.scoreboard",league="friday"'
+    assert samples[f'mario_latency_seconds_bucket{{{labels},le="0.001"}}'] == 0
+    assert samples[f'mario_latency_seconds_bucket{{{labels},le="0.005"}}'] == 1
+    assert samples[f'mario_latency_seconds_bucket{{{labels},le="0.025"}}'] == 3
+    assert samples[f'mario_latency_seconds_bucket{{{labels},le="10.0"}}'] == 3
+    assert samples[f'mario_latency_seconds_bucket{{{labels},le="+Inf"}}'] == 4
+    assert samples[f"mario_latency_seconds_count{{{labels}}}"] == 4
+    assert samples[f"mario_latency_seconds_sum{{{labels}}}"] == pytest.approx(20.042)
+
+
+def test_label_values_are_escaped():
+    metrics.observe("op", 0.1, league='a "quoted"\\league\n')
+    assert 'league="a \\"quoted\\"\\\\league\\n"' in metrics.render_prometheus()
+
+
+def test_timed_records_under_the_threads_league():
+    metrics.set_league("tuesday")
+
+    @metrics.timed("work")
+    def work():
+        return 42
+
+    assert work() == 42
+    assert metrics._histograms[("work", "tuesday")][1] == 1
+
+
+def test_export_failure_is_logged_not_raised(tmp_path, caplog):
+    missing = tmp_path / "no" / "such" / "dir" / "metrics.prom"
+    metrics.observe("op", 0.1, league="l")
+    metrics.export(str(missing))
+    metrics.export(str(missing))
+    assert len([r for r in caplog.records if "Can't write metrics" in r.message]) == 1
+
+    ok = tmp_path / "metrics.prom"
+    metrics.export(str(ok))
+    assert 'op="op"' in ok.read_text()
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_http_server_binds_loopback_and_survives_a_taken_port(caplog):
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        metrics.start_http_server(port)
+        metrics.start_http_server(port)
+    assert len([r for r in caplog.records if "Can't serve metrics" in r.message]) == 1
+
+    metrics._server = None
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    metrics.start_http_server(port)
+    try:
+        assert metrics._server.server_address[0] == "127.0.0.1"
+        metrics.observe("op", 0.1, league="l")
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+        assert 'op="op"' in body
+    finally:
+        metrics._server.shutdown()
+        metrics._server.server_close()
@@ -0,0 +1,98 @@
+# tests/test_recompute.py
+import json
+import sqlite3
+
+import pytest
+
+import recompute
+import storage_backends
+from score_calculator import compute_game_points
+from storage_backends import SqliteBackend
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+@pytest.fixture
+def stale_db(tmp_path, monkeypatch, make_season):
+    """Three SQLite leagues whose stored points are all zero."""
+    path = str(tmp_path / "marioparty.db")
+    # Worker processes pick the backend up from the environment
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_FILE", path)
+    monkeypatch.setattr(storage_backends, "_backend", None)
+
+    backend = SqliteBackend(path)
+    for league, n in (("a", 4), ("b", 7), ("c", 2)):
+        for g in make_season(n):
+            g["points"] = {p: 0 for p in PLAYERS}
+            backend.save_game(league, g["game_id"], g)
+    return backend
+
+
+def stored_points(backend, league):
+    return [
+        (row["payload"]["points"], compute_game_points(row["payload"], PLAYERS))
+        for row in backend.load_games(league, limit=None)
+    ]
+
+
+def is_current(backend, league):
+    return all(old == new for old, new in stored_points(backend, league))
+
+
+def test_rewrites_every_league(stale_db, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    results, failed = recompute.run(["a", "b", "c"], workers=2, checkpoint=checkpoint)
+
+    assert failed == []
+    assert sorted(r["session_id"] for r in results) == ["a", "b", "c"]
+    assert all(is_current(stale_db, league) for league in "abc")
+    assert recompute.load_checkpoint(checkpoint) == {"a", "b", "c"}
+    # The normalized results table is rewritten too
+    with sqlite3.connect(stale_db.path) as conn:
+        (total,) = conn.execute(
+            "SELECT SUM(points) FROM results WHERE session_id = 'b'"
+        ).fetchone()
+    assert total == sum(sum(new.values()) for _, new in stored_points(stale_db, "b"))
+
+
+def test_resumes_from_checkpoint(stale_db, tmp_path, capsys):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    recompute.save_checkpoint(checkpoint, {"a"})
+
+    results, failed = recompute.run(["a", "b", "c"], workers=2, checkpoint=checkpoint)
+
+    assert failed == []
+    assert sorted(r["session_id"] for r in results) == ["b", "c"]
+    assert "1 league(s) already done, 2 to go" in capsys.readouterr().out
+    # "a" counted as done, so it was left alone
+    assert not is_current(stale_db, "a")
+    assert is_current(stale_db, "b") and is_current(stale_db, "c")
+    assert recompute.load_checkpoint(checkpoint) == {"a", "b", "c"}
+
+
+def test_checkpoint_from_other_rules_is_ignored(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"rules": "{}", "done": ["a"]}))
+    assert recompute.load_checkpoint(str(checkpoint)) == set()
+
+
+def test_dry_run_writes_nothing(stale_db, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    results, failed = recompute.run(["b"], workers=1, dry_run=True, checkpoint=checkpoint)
+
+    assert failed == []
+    assert len(results[0]["changed"]) == 7
+    assert not is_current(stale_db, "b")
+    assert recompute.load_checkpoint(checkpoint) == set()
+
+
+def test_empty_league_fails_and_is_not_checkpointed(stale_db, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with pytest.raises(SystemExit) as exc:
+        recompute.main(["--league", "c", "--league", "missing", "--workers", "2",
+                        "--checkpoint", checkpoint])
+
+    assert exc.value.code == 1
+    assert is_current(stale_db, "c")
+    assert recompute.load_checkpoint(checkpoint) == {"c"}
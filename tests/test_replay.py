@@ -0,0 +1,145 @@
+# tests/test_replay.py
+import random
+
+import pytest
+
+import consistency
+import scoreboard
+from replay import BASELINE_NAME, Ruleset, load_features, replay, score_rulesets
+from scoreboard import compute_standings
+from storage_backends import SqliteBackend
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+@pytest.fixture
+def league_backend(tmp_path, make_season):
+    backend = SqliteBackend(str(tmp_path / "marioparty.db"))
+    seasons = {"a": make_season(12), "b": make_season(5), "old": make_season(6, legacy=True)}
+    for league, games in seasons.items():
+        for g in games:
+            backend.save_game(league, g["game_id"], g)
+    return backend, seasons
+
+
+def test_current_ruleset_reproduces_scoreboard(league_backend):
+    backend, seasons = league_backend
+    report = replay([], list(seasons), backend)
+
+    assert set(report["Ruleset"]) == {BASELINE_NAME}
+    for league, games in seasons.items():
+        expected = compute_standings(games, PLAYERS)
+        rows = report[report["League"] == league].set_index("Player")
+        assert rows["Total Points"].to_dict() == expected["final_totals"]
+        assert rows["Rank"].to_dict() == expected["ranks"]
+        assert (rows["Points Change"] == 0).all()
+
+
+def test_score_rulesets_matches_scoring_with_patched_constants(league_backend, monkeypatch):
+    backend, seasons = league_backend
+    rng = random.Random(3)
+    rulesets = [
+        Ruleset(
+            f"r{i}",
+            placement_points=tuple(rng.randint(0, 12) for _ in range(4)),
+            bonus_star_points=rng.randint(0, 3),
+            coin_threshold=rng.randint(10, 40),
+            coin_threshold_max=rng.randint(0, 4),
+            coin_threshold_points=rng.randint(0, 2),
+            most_coins_points=rng.randint(0, 3),
+            least_coins_points=rng.randint(-2, 0),
+            items_points=rng.randint(0, 2),
+            spaces_points=rng.randint(0, 2),
+            minigame_most_wins_points=rng.randint(0, 4),
+            minigame_second_wins_points=rng.randint(0, 2),
+            back_to_back_points=rng.randint(0, 3),
+            three_straight_points=rng.randint(0, 4),
+            no_fourth_points=rng.randint(0, 3),
+        )
+        for i in range(5)
+    ]
+    features = load_features(list(seasons), backend)
+    groups, totals = score_rulesets(features, rulesets)
+
+    for i, r in enumerate(rulesets):
+        for name, value in {
+            "PLACEMENT_POINTS": dict(zip((1, 2, 3, 4), r.placement_points)),
+            "BONUS_STAR_POINTS": r.bonus_star_points,
+            "COIN_THRESHOLD": r.coin_threshold,
+            "COIN_THRESHOLD_MAX": r.coin_threshold_max,
+            "COIN_THRESHOLD_POINTS": r.coin_threshold_points,
+            "MOST_COINS_POINTS": r.most_coins_points,
+            "LEAST_COINS_POINTS": r.least_coins_points,
+            "MOST_ITEMS_POINTS": r.items_points,
+            "MOST_SPACES_POINTS": r.spaces_points,
+            "MINIGAME_MOST_WINS_POINTS": r.minigame_most_wins_points,
+            "MINIGAME_SECOND_WINS_POINTS": r.minigame_second_wins_points,
+        }.items():
+            monkeypatch.setattr(scoreboard, name, value)
+        monkeypatch.setattr(consistency, "BACK_TO_BACK_TOP2_POINTS", r.back_to_back_points)
+        monkeypatch.setattr(consistency, "THREE_STRAIGHT_TOP2_POINTS", r.three_straight_points)
+        monkeypatch.setattr(consistency, "NO_FOURTH_IN_FIVE_POINTS", r.no_fourth_points)
+
+        for league, games in seasons.items():
+            expected = compute_standings(games, PLAYERS)["final_totals"]
+            got = {
+                player: int(totals[i, g])
+                for g, (lg, player) in enumerate(groups.itertuples(index=False))
+                if lg == league
+            }
+            assert got == expected, r.name
+
+
+def test_minigame_points_apply_to_games_saved_by_the_calculator(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "marioparty.db"))
+    # What score_calculator_page saves with Simer picked for most minigame wins
+    results = {
+        p: {
+            "placement": place,
+            "bonus_stars": 0,
+            "coins": 10 * place,
+            "most_items_used": False,
+            "most_spaces_travelled": False,
+            "minigame_most_wins": p == "Simer",
+            "minigame_second_wins": p == "Rav",
+        }
+        for place, p in enumerate(PLAYERS, start=1)
+    }
+    game = {"game_id": 1, "results": results}
+    backend.save_game("l", 1, game)
+
+    report = replay(
+        [Ruleset("MG10", minigame_most_wins_points=10, minigame_second_wins_points=4)],
+        ["l"], backend,
+    )
+    change = report[report["Ruleset"] == "MG10"].set_index("Player")["Points Change"].to_dict()
+    assert change == {"Amber": 0, "Mandeep": 0, "Rav": 3, "Simer": 7}
+
+
+def test_from_dict_requires_a_name():
+    with pytest.raises(ValueError, match="name"):
+        Ruleset.from_dict({"placement_points": [10, 6, 3, 0]})
+
+
+def test_from_dict_validates_fields():
+    with pytest.raises(ValueError, match="Unknown"):
+        Ruleset.from_dict({"name": "x", "coin_points": 1})
+    with pytest.raises(ValueError, match="placement_points"):
+        Ruleset.from_dict({"name": "x", "placement_points": [1, 2, 3]})
+    with pytest.raises(ValueError, match="coin_threshold"):
+        Ruleset.from_dict({"name": "x", "coin_threshold": 0})
+
+
+def test_replay_rejects_duplicate_names(league_backend):
+    backend, seasons = league_backend
+    with pytest.raises(ValueError, match="Duplicate"):
+        replay([Ruleset("x"), Ruleset("x", bonus_star_points=3)], list(seasons), backend)
+    with pytest.raises(ValueError, match=BASELINE_NAME):
+        replay([Ruleset(BASELINE_NAME, bonus_star_points=3)], list(seasons), backend)
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_stored_points_match_the_scoreboard_breakdown(make_season, legacy):
+    for game in make_season(40, legacy=legacy):
+        breakdown = scoreboard.compute_game_points_breakdown(game, PLAYERS)
+        assert {p: b["base_total"] for p, b in breakdown.items()} == game["points"]
@@ -0,0 +1,81 @@
+# tests/test_season_store.py
+from types import MappingProxyType
+
+import pytest
+
+from season_store import Season, SeasonStore, freeze
+
+
+def game(game_id, **extra):
+    return {"game_id": game_id, "results": {"Amber": {"placement": 1}}, **extra}
+
+
+def test_freeze_is_a_deep_read_only_copy():
+    source = {"game_id": 1, "results": {"Amber": {"placement": 1}}, "tags": ["a", ["b"]]}
+    frozen = freeze(source)
+
+    assert isinstance(frozen, MappingProxyType)
+    assert frozen["tags"] == ("a", ("b",))
+    with pytest.raises(TypeError):
+        frozen["results"]["Amber"]["placement"] = 2
+    source["results"]["Amber"]["placement"] = 4
+    assert frozen["results"]["Amber"]["placement"] == 1
+
+
+def test_next_game_id():
+    assert Season("l", 0, ()).next_game_id == 1
+    assert Season("l", 1, freeze([game(3), game(7), game(5)])).next_game_id == 8
+
+
+def test_publish_is_copy_on_write():
+    store = SeasonStore()
+    first = store.load("l", [game(1)])
+    second = store.publish("l", game(2))
+
+    assert (first.version, second.version) == (1, 2)
+    assert [g["game_id"] for g in first.games] == [1]
+    assert [g["game_id"] for g in second.games] == [1, 2]
+    assert store.get("l") is second
+
+
+def test_publish_renumbers_a_taken_game_id():
+    store = SeasonStore()
+    store.load("l", [game(1), game(2)])
+    # Two sessions both drafted game 3
+    store.publish("l", game(3, note="first"))
+    season = store.publish("l", game(3, note="second"))
+
+    assert [g["game_id"] for g in season.games] == [1, 2, 3, 4]
+    assert season.games[-1]["note"] == "second"
+
+
+def test_publish_to_an_unloaded_league_starts_it():
+    season = SeasonStore().publish("new", game(1))
+    assert (season.version, len(season.games)) == (1, 1)
+
+
+def test_second_load_keeps_the_first():
+    store = SeasonStore()
+    first = store.load("l", [game(1)])
+    assert store.load("l", [game(1), game(2)]) is first
+    assert not store.needs_load("l")
+
+
+def test_degraded_load_is_retried_and_replaced(monkeypatch):
+    store = SeasonStore()
+    monkeypatch.setattr(store, "RETRY_SECONDS", 3600)
+    store.load("l", [], degraded=True)
+    assert not store.needs_load("l")
+
+    monkeypatch.setattr(store, "RETRY_SECONDS", 0)
+    assert store.needs_load("l")
+
+    # A failed retry keeps what the sessions have published meanwhile
+    store.publish("l", game(1))
+    assert [g["game_id"] for g in store.load("l", [], degraded=True).games] == [1]
+
+    season = store.load("l", [game(1), game(2), game(3)])
+    assert not season.degraded
+    assert season.version == 3
+    assert season.next_game_id == 4
+    assert not store.needs_load("l")
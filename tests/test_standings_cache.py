@@ -0,0 +1,116 @@
+# tests/test_standings_cache.py
+import os
+import time
+
+import pytest
+
+import standings_cache
+from scoreboard import compute_standings
+
+PLAYERS = ["Amber", "Mandeep", "Rav", "Simer"]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(standings_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def counting(compute):
+    calls = []
+
+    def wrapper(games, players):
+        calls.append(1)
+        return compute(games, players)
+    wrapper.calls = calls
+    return wrapper
+
+
+def test_second_call_is_served_from_disk(make_season):
+    games = make_season(6)
+    compute = counting(compute_standings)
+
+    first = standings_cache.get_or_compute(games, PLAYERS, compute)
+    second = standings_cache.get_or_compute(games, PLAYERS, compute)
+
+    assert len(compute.calls) == 1
+    assert second["final_totals"] == first["final_totals"]
+
+
+def test_rule_change_misses_the_cache(make_season, monkeypatch):
+    games = make_season(3)
+    key = standings_cache.cache_key(games, PLAYERS)
+    monkeypatch.setattr("score_calculator.MOST_COINS_POINTS", 5)
+    assert standings_cache.cache_key(games, PLAYERS) != key
+
+
+def test_corrupt_entry_is_dropped(make_season, cache_dir):
+    games = make_season(3)
+    key = standings_cache.cache_key(games, PLAYERS)
+    cache_dir.mkdir()
+    (cache_dir / f"{key}.pkl").write_bytes(b"not a pickle")
+
+    assert standings_cache.load(key) is None
+    assert not (cache_dir / f"{key}.pkl").exists()
+
+
+def test_load_survives_touch_and_remove_failures(make_season, monkeypatch):
+    games = make_season(3)
+    key = standings_cache.cache_key(games, PLAYERS)
+    standings_cache.store(key, {"total_games": 3})
+
+    def denied(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(os, "utime", denied)
+    assert standings_cache.load(key) == {"total_games": 3}
+
+    monkeypatch.setattr("pickle.load", lambda f: (_ for _ in ()).throw(EOFError()))
+    monkeypatch.setattr(os, "remove", denied)
+    assert standings_cache.load(key) is None
+
+
+def test_evict_drops_least_recently_used(cache_dir):
+    now = time.time()
+    for i, key in enumerate(["old", "mid", "new"]):
+        standings_cache.store(key, b"x" * 1000)
+        os.utime(cache_dir / f"{key}.pkl", (now - 10 + i, now - 10 + i))
+
+    standings_cache.evict(max_bytes=2500)
+    assert sorted(os.listdir(cache_dir)) == ["mid.pkl", "new.pkl"]
+
+
+def test_concurrent_stores_of_one_key_dont_collide(cache_dir):
+    import threading
+
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                standings_cache.store("same", {"n": n, "i": i})
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert standings_cache.load("same")["i"] == 49
+    assert os.listdir(cache_dir) == ["same.pkl"]
+
+
+def test_evict_removes_abandoned_temp_files(cache_dir):
+    cache_dir.mkdir()
+    stale = cache_dir / "abc.x1.tmp"
+    fresh = cache_dir / "abc.x2.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"in flight")
+    old = time.time() - standings_cache.TMP_MAX_AGE_SECONDS - 1
+    os.utime(stale, (old, old))
+
+    standings_cache.evict()
+    assert sorted(os.listdir(cache_dir)) == ["abc.x2.tmp"]
@@ -0,0 +1,97 @@
+# tests/test_storage_backends.py
+import os
+
+import pytest
+
+from fake_supabase import FakeSupabase
+from storage_backends import JsonFileBackend, SqliteBackend, SupabaseBackend
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    return SqliteBackend(str(tmp_path / "marioparty.db"))
+
+
+@pytest.fixture
+def json_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr("storage.DATA_FILE", str(tmp_path / "marioparty_data.json"))
+    return JsonFileBackend()
+
+
+@pytest.fixture
+def supabase_backend(monkeypatch):
+    import supabase_db
+
+    with FakeSupabase() as fake:
+        monkeypatch.setenv("SUPABASE_URL", fake.url)
+        monkeypatch.setenv("SUPABASE_ANON_KEY", "test-key")
+        supabase_db.get_supabase.clear()
+        backend = SupabaseBackend()
+        yield backend
+        supabase_db.get_supabase().close()
+        supabase_db.get_supabase.clear()
+
+
+@pytest.fixture(params=["json", "sqlite", "supabase"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_backend")
+
+
+def test_iter_games_is_in_game_id_order(backend, make_season):
+    games = make_season(12)
+    # Saved out of order, with ids that sort differently as text
+    for g in games[5:] + games[:5]:
+        backend.save_game("league", g["game_id"], g)
+    backend.save_game("other", 1, games[0])
+
+    streamed = [g for chunk in backend.iter_games("league", chunk_size=5) for g in chunk]
+    assert [g["game_id"] for g in streamed] == list(range(1, 13))
+
+
+def test_iter_games_many_keeps_each_league_in_order(backend, make_season):
+    seasons = {"a": make_season(7), "b": make_season(3), "c": []}
+    for league, games in seasons.items():
+        for g in reversed(games):
+            backend.save_game(league, g["game_id"], g)
+
+    streamed = {}
+    for league, chunk in backend.iter_games_many(["a", "b", "c"], chunk_size=2):
+        streamed.setdefault(league, []).extend(g["game_id"] for g in chunk)
+    assert streamed == {"a": list(range(1, 8)), "b": [1, 2, 3]}
+
+
+def test_update_games_replaces_payloads(backend, make_season):
+    for g in make_season(3):
+        backend.save_game("league", g["game_id"], g)
+    rows = backend.load_games("league", limit=None)
+    backend.update_games("league", [
+        {"id": row["id"], "payload": dict(row["payload"], points={"Amber": 99})}
+        for row in rows[:2]
+    ])
+
+    points = sorted(row["payload"]["points"].get("Amber") for row in backend.load_games("league", limit=None))
+    assert points.count(99) == 2
+
+
+def test_json_saves_are_atomic(json_backend, make_season):
+    import storage
+
+    for g in make_season(2):
+        json_backend.save_game("league", g["game_id"], g)
+    leftovers = [f for f in os.listdir(os.path.dirname(storage.DATA_FILE)) if f.endswith(".tmp")]
+    assert leftovers == []
+    assert len(json_backend.load_games("league", limit=None)) == 2
+
+
+@pytest.mark.parametrize("sql", [
+    "UPDATE results SET points = 1 WHERE game_row = 1 AND player = 'Amber'",
+    "DELETE FROM results WHERE game_row = 1",
+    "SELECT payload FROM games WHERE session_id = 'league' ORDER BY game_id, id",
+])
+def test_sqlite_queries_use_indexes(sqlite_backend, sql):
+    import sqlite3
+
+    with sqlite3.connect(sqlite_backend.path) as conn:
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+    assert "TEMP B-TREE" not in plan